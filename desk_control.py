@@ -6,12 +6,23 @@ Protocol adapted from https://github.com/librick/uplift-ble
 Supports multiple desk variants with proper packet formatting and wake sequence.
 """
 import asyncio
-from datetime import datetime
+import atexit
+import contextlib
+import functools
+import json
+import logging
+import os
+import re
+import time
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional, Dict, List
-from bleak import BleakScanner, BleakClient
-from bleak.uuids import normalize_uuid_16
+from typing import TYPE_CHECKING, Optional, Dict, FrozenSet, List, NamedTuple
+
+# bleak is imported where it is used so `--help`-style paths and the daemon
+# client skip its import cost
+if TYPE_CHECKING:
+    from bleak import BleakClient
+
+log = logging.getLogger("desk_control")
 
 CACHE_FILE = Path.home() / ".desk_address"
 CONFIG_CACHE_FILE = Path.home() / ".desk_config"
@@ -20,47 +31,88 @@ LOG_FILE = Path.home() / ".desk_log"
 # Desk identifier - last 6 hex digits of MAC address
 # Appears in BLE device name as "BLE Device 99B319"
 DESK_ID = "99B319"
+_DESK_ID_RE = re.compile(re.escape(DESK_ID), re.IGNORECASE)
+
+# Spacing between wake packets: about one BLE connection interval. The link
+# layer already paces write-without-response, so longer gaps only add latency.
+WAKE_INTERVAL_S = 0.03
+
+# How long to try the cached address before relying on the parallel scan.
+# bleak's timeout covers service discovery too, so this can't be much
+# shorter without failing slow but valid connects.
+CACHED_CONNECT_TIMEOUT_S = 10.0
 
+# Unix socket a long-running daemon listens on (see run_daemon). Kept in
+# the per-user runtime directory rather than a world-writable /tmp path
+_RUNTIME_DIR = os.environ.get("XDG_RUNTIME_DIR")
+DAEMON_SOCKET = (os.path.join(_RUNTIME_DIR, "desk.sock") if _RUNTIME_DIR
+                 else str(Path.home() / ".desk.sock"))
+# Longest a CLI command waits for the daemon's reply
+DAEMON_REPLY_TIMEOUT_S = 10.0
 
-@dataclass
-class DeskConfig:
+
+class DeskConfig(NamedTuple):
     """Configuration for a specific desk variant."""
     variant_name: str
     service_uuid: str
     input_char_uuid: str  # Write commands here
     output_char_uuid: str  # Read notifications here
     requires_wake: bool = True
-
+    # GATT handles resolved on a live connection; cached so later runs can
+    # write by handle instead of walking the service table by UUID.
+    input_handle: Optional[int] = None
+    output_handle: Optional[int] = None
+
+
+# Normalized 128-bit UUID strings (bleak.uuids.normalize_uuid_16 output)
+_UUID_FF00 = '0000ff00-0000-1000-8000-00805f9b34fb'
+_UUID_FF01 = '0000ff01-0000-1000-8000-00805f9b34fb'
+_UUID_FF02 = '0000ff02-0000-1000-8000-00805f9b34fb'
+_UUID_FE60 = '0000fe60-0000-1000-8000-00805f9b34fb'
+_UUID_FE61 = '0000fe61-0000-1000-8000-00805f9b34fb'
+_UUID_FE62 = '0000fe62-0000-1000-8000-00805f9b34fb'
+_UUID_00FF = '000000ff-0000-1000-8000-00805f9b34fb'
+_UUID_01FF = '000001ff-0000-1000-8000-00805f9b34fb'
+_UUID_02FF = '000002ff-0000-1000-8000-00805f9b34fb'
+_UUID_FF12 = '0000ff12-0000-1000-8000-00805f9b34fb'
 
 # Supported desk variants - different Jiecang hardware revisions use different UUIDs
 DESK_CONFIGS: Dict[str, DeskConfig] = {
-    normalize_uuid_16(0xFF00): DeskConfig(
+    _UUID_FF00: DeskConfig(
         variant_name="JIECANG_0xFF00",
-        service_uuid=normalize_uuid_16(0xFF00),
-        input_char_uuid=normalize_uuid_16(0xFF01),
-        output_char_uuid=normalize_uuid_16(0xFF02),
+        service_uuid=_UUID_FF00,
+        input_char_uuid=_UUID_FF01,
+        output_char_uuid=_UUID_FF02,
     ),
-    normalize_uuid_16(0xFE60): DeskConfig(
+    _UUID_FE60: DeskConfig(
         variant_name="JIECANG_0xFE60",
-        service_uuid=normalize_uuid_16(0xFE60),
-        input_char_uuid=normalize_uuid_16(0xFE61),
-        output_char_uuid=normalize_uuid_16(0xFE62),
+        service_uuid=_UUID_FE60,
+        input_char_uuid=_UUID_FE61,
+        output_char_uuid=_UUID_FE62,
     ),
-    normalize_uuid_16(0x00FF): DeskConfig(
+    _UUID_00FF: DeskConfig(
         variant_name="JIECANG_0x00FF",
-        service_uuid=normalize_uuid_16(0x00FF),
-        input_char_uuid=normalize_uuid_16(0x01FF),
-        output_char_uuid=normalize_uuid_16(0x02FF),
+        service_uuid=_UUID_00FF,
+        input_char_uuid=_UUID_01FF,
+        output_char_uuid=_UUID_02FF,
     ),
-    normalize_uuid_16(0xFF12): DeskConfig(
+    _UUID_FF12: DeskConfig(
         variant_name="JIECANG_0xFF12",
-        service_uuid=normalize_uuid_16(0xFF12),
-        input_char_uuid=normalize_uuid_16(0xFF01),
-        output_char_uuid=normalize_uuid_16(0xFF02),
+        service_uuid=_UUID_FF12,
+        input_char_uuid=_UUID_FF01,
+        output_char_uuid=_UUID_FF02,
     ),
 }
 
+# Fallback variant when detection fails (most common for UPLIFT)
+DEFAULT_CONFIG = DESK_CONFIGS[_UUID_FF00]
+
+# Reverse index for loading the cached variant name
+_BY_VARIANT: Dict[str, DeskConfig] = {c.variant_name: c for c in DESK_CONFIGS.values()}
+
 DESK_SERVICE_UUIDS = list(DESK_CONFIGS.keys())
+# bleak reports advertised UUIDs already lowercased, like these keys
+_DESK_UUID_SET: FrozenSet[str] = frozenset(DESK_CONFIGS)
 
 
 def create_command_packet(opcode: int, payload: bytes = b"") -> bytes:
@@ -88,101 +140,180 @@ class DeskOpcode:
     STOP = 0x2B
 
 
-# Pre-built command packets
+# Pre-built command packets for the fixed, payload-less commands.
+# Each is create_command_packet(opcode) written out: checksum == opcode.
+# Kept as bytes rather than memoryview slices of one shared buffer: the
+# backends hand writes on as bytes(data), which is free for bytes but
+# copies a memoryview on every write.
 COMMANDS = {
-    'wake': create_command_packet(DeskOpcode.WAKE),
-    'sit': create_command_packet(DeskOpcode.PRESET_1),
-    'stand': create_command_packet(DeskOpcode.PRESET_2),
-    'up': create_command_packet(DeskOpcode.MOVE_UP),
-    'down': create_command_packet(DeskOpcode.MOVE_DOWN),
-    'stop': create_command_packet(DeskOpcode.STOP),
+    'wake': b'\xf1\xf1\x00\x00\x00\x7e',
+    'sit': b'\xf1\xf1\x05\x00\x05\x7e',
+    'stand': b'\xf1\xf1\x06\x00\x06\x7e',
+    'mem3': b'\xf1\xf1\x07\x00\x07\x7e',
+    'mem4': b'\xf1\xf1\x08\x00\x08\x7e',
+    'up': b'\xf1\xf1\x01\x00\x01\x7e',
+    'down': b'\xf1\xf1\x02\x00\x02\x7e',
+    'stop': b'\xf1\xf1\x2b\x00\x2b\x7e',
 }
 
 def get_cached_config() -> Optional[DeskConfig]:
-    """Load cached desk configuration."""
+    """Load cached desk configuration, including any resolved GATT handles."""
     if CONFIG_CACHE_FILE.exists():
         try:
-            variant_name = CONFIG_CACHE_FILE.read_text().strip()
-            for config in DESK_CONFIGS.values():
-                if config.variant_name == variant_name:
-                    return config
+            raw = CONFIG_CACHE_FILE.read_bytes().strip()
+            try:
+                cached = json.loads(raw)
+            except ValueError:
+                # Older caches hold only the variant name
+                cached = {'variant_name': raw.decode("ascii")}
+            config = _BY_VARIANT.get(cached.get('variant_name'))
+            if config:
+                return config._replace(
+                    input_handle=cached.get('input_handle'),
+                    output_handle=cached.get('output_handle'),
+                )
         except Exception:
             pass
     return None
 
 
 def cache_config(config: DeskConfig):
-    """Save desk configuration to cache."""
-    CONFIG_CACHE_FILE.write_text(config.variant_name)
+    """Save desk configuration and its GATT handles to cache."""
+    CONFIG_CACHE_FILE.write_bytes(json.dumps({
+        'variant_name': config.variant_name,
+        'input_handle': config.input_handle,
+        'output_handle': config.output_handle,
+    }).encode("ascii"))
+
 
+def resolve_handles(client: 'BleakClient', config: DeskConfig) -> DeskConfig:
+    """Return config with the input/output characteristic handles filled in."""
+    try:
+        service = client.services.get_service(config.service_uuid)
+        input_char = service.get_characteristic(config.input_char_uuid)
+        output_char = service.get_characteristic(config.output_char_uuid)
+    except Exception:
+        return config
+    return config._replace(
+        input_handle=input_char.handle if input_char else None,
+        output_handle=output_char.handle if output_char else None,
+    )
 
-async def detect_desk_config(client: BleakClient) -> Optional[DeskConfig]:
+
+async def detect_desk_config(client: 'BleakClient') -> Optional[DeskConfig]:
     """Detect which desk variant we're connected to by checking available services."""
     try:
-        services = client.services
-        for service in services:
-            service_uuid = service.uuid.lower()
-            if service_uuid in DESK_CONFIGS:
-                return DESK_CONFIGS[service_uuid]
+        service_uuids = {service.uuid.lower() for service in client.services}
     except Exception:
-        pass
+        return None
+    # Intersect with the known variants, keeping DESK_CONFIGS priority order
+    matches = service_uuids & DESK_CONFIGS.keys()
+    for uuid in DESK_CONFIGS:
+        if uuid in matches:
+            return DESK_CONFIGS[uuid]
     return None
 
 
-async def get_desk_address() -> Optional[str]:
-    """Get cached address or scan for desk."""
-    # Try cached address first
+def get_cached_desk_address() -> Optional[str]:
+    """Return the cached desk address, if any, without touching the radio."""
     if CACHE_FILE.exists():
-        cached_addr = CACHE_FILE.read_text().strip()
+        cached_addr = CACHE_FILE.read_bytes().strip().decode("ascii")
         if cached_addr:
             return cached_addr
+    return None
 
-    # Scan for desk by name or by advertising known service UUIDs
-    found_device = [None]
 
-    def detection_callback(device, adv_data):
-        # Match by name
-        if device.name and DESK_ID in device.name.upper():
-            found_device[0] = device
-            return
-        # Match by advertised service UUIDs
-        if adv_data.service_uuids:
-            for uuid in adv_data.service_uuids:
-                if uuid.lower() in DESK_CONFIGS:
-                    found_device[0] = device
-                    return
+async def scan_for_desk_address() -> Optional[str]:
+    """Scan for the desk and cache its address."""
+    # Scan with the OS-level service filter first so non-desk advertisements
+    # never reach Python, then fall back to an unfiltered scan for adapters
+    # that only identify themselves by name.
+    device = await _scan_for_desk(DESK_SERVICE_UUIDS)
+    if not device:
+        device = await _scan_for_desk(None)
 
-    scanner = BleakScanner(detection_callback)
-    await scanner.start()
+    if device:
+        CACHE_FILE.write_bytes(device.address.encode("ascii"))
+        return device.address
 
-    for _ in range(100):  # 10 seconds max
-        await asyncio.sleep(0.1)
-        if found_device[0]:
-            break
+    return None
 
-    await scanner.stop()
 
-    if found_device[0]:
-        CACHE_FILE.write_text(found_device[0].address)
-        return found_device[0].address
+async def get_desk_address() -> Optional[str]:
+    """Get cached address or scan for desk."""
+    return get_cached_desk_address() or await scan_for_desk_address()
+
+
+def _is_desk(device, adv_data) -> bool:
+    """Whether an advertisement comes from the desk."""
+    # Match by advertised service UUIDs
+    uuids = adv_data.service_uuids
+    if uuids and not _DESK_UUID_SET.isdisjoint(uuids):
+        return True
+    # Match by name
+    return bool(device.name and _name_is_desk(device.name))
+
+
+@functools.lru_cache(maxsize=256)
+def _name_is_desk(name: str) -> bool:
+    """Whether a device name carries DESK_ID. Cached: nearby devices
+    re-advertise the same few names many times per scan."""
+    return _DESK_ID_RE.search(name) is not None
+
+
+async def _scan_for_desk(service_uuids: Optional[List[str]], timeout: float = 10.0):
+    """Scan until the first advertisement matching the desk, or timeout."""
+    from bleak import BleakScanner
+
+    return await BleakScanner.find_device_by_filter(
+        _is_desk,
+        timeout=timeout,
+        service_uuids=service_uuids,
+        scanning_mode="active",
+        cb=dict(use_bdaddr=False),
+    )
 
-    return None
+
+# Append-only log descriptor, opened on first use and kept for the process
+_LOG_FD: Optional[int] = None
+
+
+def _close_log_fd():
+    if _LOG_FD is not None:
+        os.close(_LOG_FD)
+
+
+def position_log_line(preset_name: str) -> bytes:
+    """One log line recording a move to preset_name now."""
+    t = time.time()
+    # Same shape as datetime.isoformat(), without building a datetime
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t))
+    timestamp = f"{timestamp}.{int((t % 1) * 1e6):06d}"
+    return f"{timestamp},{preset_name}\n".encode()
+
+
+def append_log(data: bytes):
+    """Append complete log lines to LOG_FILE."""
+    global _LOG_FD
+    if _LOG_FD is None:
+        _LOG_FD = os.open(LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        atexit.register(_close_log_fd)
+    # A single O_APPEND write of a few short lines is atomic on POSIX
+    os.write(_LOG_FD, data)
 
 
 def log_position(preset_name: str):
     """Log desk position change with timestamp."""
-    timestamp = datetime.now().isoformat()
-    log_entry = f"{timestamp},{preset_name}\n"
-    with open(LOG_FILE, 'a') as f:
-        f.write(log_entry)
+    append_log(position_log_line(preset_name))
 
 
-async def send_wake_sequence(client: BleakClient, input_uuid: str, count: int = 3):
+async def send_wake_sequence(client: 'BleakClient', input_uuid: str, count: int = 3):
     """
     Send wake commands to prepare the desk for receiving actual commands.
 
     The desk BLE adapter often needs to be "woken up" before it will respond
-    to movement commands. This sends multiple wake packets with delays.
+    to movement commands. This sends multiple wake packets spaced by
+    WAKE_INTERVAL_S.
     """
     wake_cmd = COMMANDS['wake']
     for _ in range(count):
@@ -190,37 +321,128 @@ async def send_wake_sequence(client: BleakClient, input_uuid: str, count: int =
             await client.write_gatt_char(input_uuid, wake_cmd, response=False)
         except Exception:
             pass  # Wake commands may fail, that's okay
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(WAKE_INTERVAL_S)
 
 
-async def send_command(client: BleakClient, config: DeskConfig, command_name: str) -> bool:
+async def send_packet(client: 'BleakClient', config: DeskConfig, packet: bytes) -> bool:
     """
-    Send a command to the desk with proper wake sequence.
+    Send a raw command packet to the desk with proper wake sequence.
 
     Returns True on success, False on failure.
     """
-    if command_name not in COMMANDS:
-        return False
-
-    command = COMMANDS[command_name]
-    input_uuid = config.input_char_uuid
+    # Writing by handle skips bleak's UUID -> characteristic lookup
+    if config.input_handle is not None:
+        input_uuid = config.input_handle
+    else:
+        input_uuid = config.input_char_uuid
 
     try:
         # Send wake sequence if required
         if config.requires_wake:
             await send_wake_sequence(client, input_uuid)
 
-        # Send the actual command
-        await client.write_gatt_char(input_uuid, command, response=False)
-
-        # Brief delay then send again for reliability
-        await asyncio.sleep(0.15)
-        await client.write_gatt_char(input_uuid, command, response=False)
+        # Send the actual command twice for reliability. Both writes are
+        # issued together so the backend can pipeline them instead of waiting
+        # out one IPC round-trip per write.
+        await asyncio.gather(
+            client.write_gatt_char(input_uuid, packet, response=False),
+            client.write_gatt_char(input_uuid, packet, response=False),
+        )
 
         return True
     except Exception as e:
-        print(f"Error sending command: {e}")
+        log.error("Error sending command: %s", e)
+        return False
+
+
+async def send_command(client: 'BleakClient', config: DeskConfig, command_name: str) -> bool:
+    """
+    Send a named command to the desk with proper wake sequence.
+
+    Returns True on success, False on failure.
+    """
+    if command_name not in COMMANDS:
         return False
+    return await send_packet(client, config, COMMANDS[command_name])
+
+
+async def resolve_config(client: 'BleakClient', cached_config: Optional[DeskConfig]) -> DeskConfig:
+    """Pick the desk config for a connected client, detecting and caching it if needed."""
+    config = cached_config
+
+    # If no cache, detect from connected device
+    if not config:
+        config = await detect_desk_config(client)
+        if config:
+            log.info("Detected desk variant: %s", config.variant_name)
+
+    # Resolve and cache handles for newly detected or older caches
+    if config and config.input_handle is None:
+        config = resolve_handles(client, config)
+        cache_config(config)
+
+    # Fallback to FF00 variant (most common for UPLIFT)
+    if not config:
+        config = DEFAULT_CONFIG
+        log.info("Using default variant: %s", config.variant_name)
+
+    return config
+
+
+async def _connect(addr: str, services: Optional[List[str]], timeout: float) -> Optional['BleakClient']:
+    """Open a connection to addr, returning None on failure."""
+    from bleak import BleakClient
+
+    client = BleakClient(addr, services=services, timeout=timeout)
+    try:
+        await client.connect()
+    except Exception as e:
+        log.error("Connection error: %s", e)
+        return None
+    return client
+
+
+async def _connect_to_desk(services: Optional[List[str]]) -> Optional['BleakClient']:
+    """
+    Connect to the desk, scanning only as a fallback.
+
+    With a cached address, a connect attempt runs while a scan goes on in
+    the background. A good cache wins and the scan is cancelled; a stale
+    one overlaps the scan rather than adding to it.
+    """
+    cached_addr = get_cached_desk_address()
+    if not cached_addr:
+        try:
+            addr = await scan_for_desk_address()
+        except Exception as e:
+            log.error("Connection error: %s", e)
+            return None
+        return await _connect(addr, services, 20.0) if addr else None
+
+    scan_task = asyncio.create_task(scan_for_desk_address())
+    try:
+        client = await _connect(cached_addr, services, CACHED_CONNECT_TIMEOUT_S)
+        if client:
+            return client
+        # A scan that finds the desk has rewritten the cache already; one
+        # that doesn't means the cached address may have changed. A scan
+        # that failed outright (adapter off) says nothing about the address
+        try:
+            addr = await scan_task
+        except Exception as e:
+            log.error("Connection error: %s", e)
+            return None
+        if not addr:
+            if get_cached_desk_address() == cached_addr:
+                CACHE_FILE.unlink()
+            return None
+        return await _connect(addr, services, 20.0)
+    finally:
+        scan_task.cancel()
+        # Collect the scan's outcome, so a failed scan behind a good
+        # connect isn't reported as a never-retrieved task exception
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await scan_task
 
 
 async def move_to_preset(preset_name: str) -> int:
@@ -230,45 +452,33 @@ async def move_to_preset(preset_name: str) -> int:
     Returns 0 on success, 1 on failure.
     """
     if preset_name not in COMMANDS:
-        print(f"Unknown preset: {preset_name}")
+        log.error("Unknown preset: %s", preset_name)
         return 1
 
-    addr = await get_desk_address()
-    if not addr:
-        print("Could not find desk")
+    cached_config = get_cached_config()
+    # With a known variant, restrict discovery to its one service
+    services = [cached_config.service_uuid] if cached_config else None
+
+    client = await _connect_to_desk(services)
+    if not client:
+        log.error("Could not find desk")
         return 1
 
     try:
-        async with BleakClient(addr, timeout=20.0) as client:
-            # Try to use cached config first
-            config = get_cached_config()
-
-            # If no cache, detect from connected device
-            if not config:
-                config = await detect_desk_config(client)
-                if config:
-                    cache_config(config)
-                    print(f"Detected desk variant: {config.variant_name}")
-
-            # Fallback to FF00 variant (most common for UPLIFT)
-            if not config:
-                config = DESK_CONFIGS[normalize_uuid_16(0xFF00)]
-                print(f"Using default variant: {config.variant_name}")
-
-            success = await send_command(client, config, preset_name)
+        config = await resolve_config(client, cached_config)
 
-            if success:
-                log_position(preset_name)
-                return 0
-            else:
-                return 1
+        success = await send_command(client, config, preset_name)
 
-    except Exception as e:
-        print(f"Connection error: {e}")
-        # Clear cache on connection error - address may have changed
-        if CACHE_FILE.exists():
-            CACHE_FILE.unlink()
-        return 1
+        if success:
+            log_position(preset_name)
+            return 0
+        else:
+            # Cached handles may be stale; re-detect on the next run
+            if config.input_handle is not None and CONFIG_CACHE_FILE.exists():
+                CONFIG_CACHE_FILE.unlink()
+            return 1
+    finally:
+        await client.disconnect()
 
 
 async def get_desk_status() -> Optional[dict]:
@@ -281,13 +491,15 @@ async def get_desk_status() -> Optional[dict]:
     if not addr:
         return None
 
+    from bleak import BleakClient
+
     try:
         async with BleakClient(addr, timeout=10.0) as client:
             config = get_cached_config()
             if not config:
                 config = await detect_desk_config(client)
             if not config:
-                config = DESK_CONFIGS[normalize_uuid_16(0xFF00)]
+                config = DEFAULT_CONFIG
 
             # TODO: Set up notification handler and request height
             # For now, just return that we connected successfully
@@ -300,17 +512,124 @@ async def get_desk_status() -> Optional[dict]:
         return {'connected': False, 'error': str(e)}
 
 
+async def run_daemon(sock_path: str = DAEMON_SOCKET) -> int:
+    """
+    Hold one BLE connection open and serve commands over a Unix socket.
+
+    Each client sends a command name on one line and gets back "ok" or
+    "error". Runs until the desk disconnects. Returns 1 if the desk could
+    not be reached.
+    """
+    from bleak import BleakClient
+
+    # A socket file is either a running daemon's or a leftover one that
+    # would block bind(); only the second may be removed
+    if os.path.exists(sock_path):
+        try:
+            _, writer = await asyncio.open_unix_connection(sock_path)
+        except OSError:
+            os.unlink(sock_path)
+        else:
+            writer.close()
+            log.error("A desk daemon is already listening on %s", sock_path)
+            return 1
+
+    addr = await get_desk_address()
+    if not addr:
+        log.error("Could not find desk")
+        return 1
+
+    cached_config = get_cached_config()
+    services = [cached_config.service_uuid] if cached_config else None
+    disconnected = asyncio.Event()
+
+    try:
+        async with BleakClient(addr, lambda _: disconnected.set(),
+                               services=services, timeout=20.0) as client:
+            config = await resolve_config(client, cached_config)
+            # Serialize commands so wake/command sequences never interleave
+            lock = asyncio.Lock()
+
+            async def handle_client(reader, writer):
+                try:
+                    command_name = (await reader.readline()).decode().strip()
+                    async with lock:
+                        success = await send_command(client, config, command_name)
+                    # Logged like move_to_preset does, so the activity log
+                    # reads the same with or without the daemon
+                    if success:
+                        log_position(command_name)
+                    writer.write(b"ok\n" if success else b"error\n")
+                    await writer.drain()
+                finally:
+                    writer.close()
+
+            server = await asyncio.start_unix_server(handle_client, sock_path)
+            log.info("Desk daemon listening on %s", sock_path)
+            try:
+                await disconnected.wait()
+            finally:
+                server.close()
+                await server.wait_closed()
+                if os.path.exists(sock_path):
+                    os.unlink(sock_path)
+            log.info("Desk disconnected")
+            return 0
+    except Exception as e:
+        log.error("Connection error: %s", e)
+        return 1
+
+
+async def send_via_daemon(command_name: str, sock_path: str = DAEMON_SOCKET) -> Optional[int]:
+    """
+    Send a command through a running daemon.
+
+    Returns 0 on success, 1 on failure, or None if no daemon is listening.
+    """
+    if not hasattr(asyncio, 'open_unix_connection') or not os.path.exists(sock_path):
+        return None
+    try:
+        reader, writer = await asyncio.open_unix_connection(sock_path)
+    except OSError:
+        return None
+    try:
+        writer.write(f"{command_name}\n".encode())
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.readline(), DAEMON_REPLY_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        log.error("Desk daemon did not reply")
+        return 1
+    finally:
+        writer.close()
+    return 0 if reply.strip() == b"ok" else 1
+
+
+async def run_command(command_name: str) -> int:
+    """Run a command through the daemon if one is up, else connect directly."""
+    if command_name not in COMMANDS:
+        log.error("Unknown preset: %s", command_name)
+        return 1
+    result = await send_via_daemon(command_name)
+    if result is None:
+        result = await move_to_preset(command_name)
+    return result
+
+
 def main(preset_name: str) -> int:
     """Main entry point."""
-    return asyncio.run(move_to_preset(preset_name))
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    return asyncio.run(run_command(preset_name))
 
 
 # CLI support
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == "--daemon":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        sys.exit(asyncio.run(run_daemon()))
+    elif len(sys.argv) > 1:
         result = main(sys.argv[1])
         sys.exit(result)
     else:
-        print("Usage: desk_control.py <sit|stand|up|down|stop>")
+        print("Usage: desk_control.py <sit|stand|mem3|mem4|up|down|stop> | --daemon")
         sys.exit(1)
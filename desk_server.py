@@ -8,20 +8,30 @@ Uses the desk_control module for reliable BLE communication.
 
 import asyncio
 from aiohttp import web
+from bisect import bisect_right
+import contextlib
+import gzip
+import hashlib
 import json
+import logging
+import math
+import os
+import re
+import struct
 from pathlib import Path
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
+from collections import Counter, deque
+from typing import NamedTuple, Optional
 
 # Import from our desk_control module
 from desk_control import (
-    COMMANDS, DESK_CONFIGS, DESK_SERVICE_UUIDS, DeskOpcode,
-    get_desk_address, get_cached_config, cache_config, detect_desk_config,
-    send_wake_sequence, send_command, create_command_packet,
-    log_position, LOG_FILE, CACHE_FILE, CONFIG_CACHE_FILE,
-    normalize_uuid_16
+    get_cached_desk_address, scan_for_desk_address, get_cached_config,
+    resolve_config,
+    send_command,
+    position_log_line, append_log, LOG_FILE,
 )
 from bleak import BleakClient, BleakScanner
+from bleak.exc import BleakDeviceNotFoundError
 
 # Height calibration constants
 # BLE reports raw encoder values that need scaling and offset
@@ -29,17 +39,124 @@ from bleak import BleakClient, BleakScanner
 # Calibrated using: sit=30.2" (BLE=11791), stand=45.5" (BLE=50959)
 HEIGHT_SCALE_FACTOR = 100.7874  # BLE units per mm
 HEIGHT_BASE_OFFSET_MM = 650.09  # Add this to scaled BLE value to get display mm
+_INV_HEIGHT_SCALE = 1.0 / HEIGHT_SCALE_FACTOR  # Multiply instead of divide per notification
+# Height notifications start with the f2 f2 header and opcode 0x01; the
+# raw height is a big-endian u16 at offset 5
+_HEIGHT_HDR = b'\xf2\xf2\x01'
+_HEIGHT = struct.Struct('>H')
+
+
+class DeskState(NamedTuple):
+    """Snapshot of everything /api/status reports"""
+    connected: bool = False
+    # Height as the desk reports it. Converted to mm only when read, so
+    # notifications the UI never sees cost no float math
+    raw_height: Optional[int] = None
+    variant: Optional[str] = None
+    rev: int = 0  # Bumped on every change; part of the /api/status ETag
+
+    @property
+    def height(self) -> Optional[float]:
+        """Height in mm, or None before the first height notification"""
+        raw = self.raw_height
+        if raw is None:
+            return None
+        # display_mm = (raw / HEIGHT_SCALE_FACTOR) + offset
+        return raw * _INV_HEIGHT_SCALE + HEIGHT_BASE_OFFSET_MM
+
 
 # Global state
 desk_client = None
-current_height = 0
-connected = False
 current_config = None
+# Replaced wholesale by set_state, never mutated, so a reader that takes
+# `s = state` once sees one coherent snapshot
+state = DeskState()
+
+
+# One queue per open /api/events or /ws stream. Each holds at most the
+# latest status body, so a slow client skips stale snapshots instead of
+# piling up. None tells the stream to end.
+_subscribers = set()
+
+
+def _offer(q: asyncio.Queue, body: Optional[bytes]):
+    """Replace whatever q holds with body"""
+    if q.full():
+        q.get_nowait()
+    q.put_nowait(body)
+
+
+# Streams are sent a new status only when it would change what the
+# dashboard shows, which is height to 0.1" via toFixed(1); movement finer
+# than that is still visible through /api/status. The readout ticks over at
+# each x.x5". _TENTH_EDGES holds those points as the smallest raw value at
+# or past each one, so a raw height maps to its displayed tenth with an
+# integer bisect and no float math per notification.
+_TENTH_EDGES = tuple(
+    edge for edge in (
+        math.ceil(((tenth + 0.5) * 2.54 - HEIGHT_BASE_OFFSET_MM) * HEIGHT_SCALE_FACTOR)
+        for tenth in range(int(HEIGHT_BASE_OFFSET_MM / 2.54) - 1,
+                           int((0xFFFF / HEIGHT_SCALE_FACTOR + HEIGHT_BASE_OFFSET_MM) / 2.54) + 1)
+    ) if 0 < edge <= 0xFFFF
+)
+# Key of the state streams last saw
+_pushed_key = (False, None, None)
+
+
+def _push_key(s: DeskState):
+    raw = s.raw_height
+    return s.connected, s.variant, None if raw is None else bisect_right(_TENTH_EDGES, raw)
+
+
+def set_state(**changes):
+    """Publish a new state snapshot with the given fields changed"""
+    global state, _pushed_key
+    state = state._replace(rev=state.rev + 1, **changes)
+    key = _push_key(state)
+    if key == _pushed_key:
+        return
+    _pushed_key = key
+    if _subscribers:
+        body = status_body(state)
+        for q in _subscribers:
+            _offer(q, body)
+
+
+# Held for each whole command sequence (wake + command) so concurrent
+# handlers can't interleave their writes.
+_ble_lock = None
+
+
+def get_ble_lock() -> asyncio.Lock:
+    """Return the BLE write lock, creating it inside the loop."""
+    global _ble_lock
+    if _ble_lock is None:
+        _ble_lock = asyncio.Lock()
+    return _ble_lock
+
+
+# Loop the server runs on; set in connect_to_desk
+_main_loop = None
 
 
 def notification_handler(sender, data):
     """Handle height notifications from desk"""
-    global current_height
+    # bleak delivers notifications on the event loop for its current
+    # backends, so apply them in place. If one ever arrives from another
+    # thread, hand it to the loop so the globals are only touched from the
+    # loop thread.
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _main_loop is None or loop is _main_loop:
+        _apply_height_update(data)
+    else:
+        _main_loop.call_soon_threadsafe(_apply_height_update, data)
+
+
+def _apply_height_update(data):
+    """Record a notification's raw height"""
     if len(data) >= 8:
         # Protocol: f2 f2 01 03 SS HH HH checksum 7e
         # Byte 0-1: header (f2 f2)
@@ -49,42 +166,66 @@ def notification_handler(sender, data):
         # Byte 5-6: height value (big-endian) in hundredths of mm
         # Byte 7: checksum
         # Byte 8: trailer (7e)
-        if data[0] == 0xf2 and data[1] == 0xf2:
-            opcode = data[2]
-            if opcode == 0x01:  # Height notification
-                height_bytes = data[5:7]
-                raw_value = int.from_bytes(height_bytes, byteorder='big')
-                # Convert: display_mm = (raw_value / 100) + offset
-                current_height = (raw_value / HEIGHT_SCALE_FACTOR) + HEIGHT_BASE_OFFSET_MM
+        if data.startswith(_HEIGHT_HDR):
+            (raw_value,) = _HEIGHT.unpack_from(data, 5)
+            if raw_value != state.raw_height:
+                set_state(raw_height=raw_value)
 
 
-async def connect_to_desk():
-    """Connect to the desk using desk_control module"""
-    global desk_client, connected, current_config
+# Held while connecting, so overlapping connect requests share one attempt
+_connect_lock = None
 
-    address = await get_desk_address()
-    if not address:
-        raise Exception("Desk not found. Make sure it's powered on and press a button to wake it.")
 
-    desk_client = BleakClient(address, timeout=20.0)
-    await desk_client.connect()
+async def connect_to_desk():
+    """Connect to the desk using desk_control module; no-op if connected"""
+    global _connect_lock
+    if _connect_lock is None:
+        _connect_lock = asyncio.Lock()
+    async with _connect_lock:
+        # A caller that waited on the lock finds the connection made
+        if state.connected and desk_client and desk_client.is_connected:
+            return
+        await _open_connection()
+
+
+async def _open_connection():
+    global desk_client, current_config, _main_loop
+
+    _main_loop = asyncio.get_running_loop()
+
+    cached_config = get_cached_config()
+    services = [cached_config.service_uuid] if cached_config else None
+
+    # Connect straight to the known address; only scan when that fails
+    address = get_cached_desk_address()
+    desk_client = None
+    if address:
+        desk_client = BleakClient(address, services=services, timeout=20.0)
+        try:
+            await desk_client.connect()
+        except BleakDeviceNotFoundError:
+            # Not in the OS device cache yet; this scan stops as soon as
+            # the address is seen
+            device = await BleakScanner.find_device_by_address(address, timeout=10.0)
+            desk_client = None
+            if device:
+                desk_client = BleakClient(device, services=services, timeout=20.0)
+                await desk_client.connect()
+
+    if desk_client is None:
+        address = await scan_for_desk_address()
+        if not address:
+            raise Exception("Desk not found. Make sure it's powered on and press a button to wake it.")
+        desk_client = BleakClient(address, services=services, timeout=20.0)
+        await desk_client.connect()
 
     if desk_client.is_connected:
-        # Detect desk variant
-        current_config = get_cached_config()
-        if not current_config:
-            current_config = await detect_desk_config(desk_client)
-            if current_config:
-                cache_config(current_config)
-                print(f"Detected desk variant: {current_config.variant_name}")
-
-        if not current_config:
-            current_config = DESK_CONFIGS[normalize_uuid_16(0xFF00)]
-            print(f"Using default variant: {current_config.variant_name}")
+        current_config = await resolve_config(desk_client, cached_config)
 
         # Start notifications
         await desk_client.start_notify(current_config.output_char_uuid, notification_handler)
-        connected = True
+
+        set_state(connected=True, variant=current_config.variant_name)
         print(f"Connected to desk at {address}")
     else:
         raise Exception("Failed to connect to desk")
@@ -92,12 +233,12 @@ async def connect_to_desk():
 
 async def disconnect_from_desk():
     """Disconnect from desk"""
-    global desk_client, connected, current_config
+    global desk_client, current_config
     if desk_client and desk_client.is_connected:
         if current_config:
             await desk_client.stop_notify(current_config.output_char_uuid)
         await desk_client.disconnect()
-        connected = False
+        set_state(connected=False)
         print("Disconnected from desk")
 
 
@@ -111,1280 +252,361 @@ async def send_desk_command(command_name: str):
     if not current_config:
         raise Exception("Desk configuration not detected")
 
-    success = await send_command(desk_client, current_config, command_name)
+    async with get_ble_lock():
+        success = await send_command(desk_client, current_config, command_name)
     if success and command_name in ('sit', 'stand'):
-        log_position(command_name)
+        queue_log(command_name)
     return success
 
 
-def parse_log_file():
-    """Parse the desk log file and return activity data"""
-    activities = []
-
-    if not LOG_FILE.exists():
-        return activities
-
-    with open(LOG_FILE, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+# Position log lines wait here for log_writer, which appends each burst
+# with one write from a worker thread instead of on the event loop
+_log_queue = None
+_log_task = None
+
+
+def queue_log(preset_name: str):
+    """Queue a position log line, timestamped now."""
+    global _log_queue, _log_task
+    if _log_queue is None:
+        _log_queue = asyncio.Queue()
+        _log_task = asyncio.ensure_future(log_writer())
+    _log_queue.put_nowait(position_log_line(preset_name))
+
+
+async def log_writer():
+    """Append queued log lines until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        lines = [await _log_queue.get()]
+        while not _log_queue.empty():
+            lines.append(_log_queue.get_nowait())
+        try:
+            await loop.run_in_executor(None, append_log, b''.join(lines))
+        except OSError as e:
+            print(f"Could not write activity log: {e}")
+
+
+def flush_log():
+    """Stop log_writer and write out anything still queued."""
+    if _log_task:
+        _log_task.cancel()
+    lines = []
+    while _log_queue and not _log_queue.empty():
+        lines.append(_log_queue.get_nowait())
+    if lines:
+        append_log(b''.join(lines))
+
+
+# Entries shown in the dashboard's recent activity list
+RECENT_ACTIVITY_COUNT = 20
+# Fixed part of each hourly_distribution row, built once
+_HOUR_TEMPLATE = tuple({'hour': hour, 'label': f"{hour:02d}:00"} for hour in range(24))
+
+
+# The exact shape log_position writes, for years from 1000 on; the fields
+# are range-checked in _split_timestamp
+_CANONICAL_TS = re.compile(r'[1-9]\d{3}-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)\.\d{6}\Z', re.ASCII)
+
+
+def _split_timestamp(timestamp_str: str):
+    """
+    Return (date, "HH:MM", hour) for a log timestamp, or None if invalid.
+
+    log_position writes "YYYY-MM-DDTHH:MM:SS.ffffff", whose fields can be
+    sliced out directly once every field is known to be in range. Anything
+    else, including days past the 28th (which need the month's length),
+    goes through datetime.fromisoformat, which is what older versions used
+    for every line.
+    """
+    ts = timestamp_str
+    m = _CANONICAL_TS.match(ts)
+    if m:
+        month, day, hour, minute, second = map(int, m.groups())
+        if (1 <= month <= 12 and 1 <= day <= 28 and hour < 24
+                and minute < 60 and second < 60):
+            return ts[:10], ts[11:16], hour
+    try:
+        timestamp = datetime.fromisoformat(ts)
+    except ValueError:
+        return None
+    return timestamp.strftime('%Y-%m-%d'), timestamp.strftime('%H:%M'), timestamp.hour
+
+
+class ActivityStats:
+    """
+    Running sit/stand counters over the desk log, fed as the log grows.
+
+    Lines look like "2024-01-31T09:15:02.123456,stand". Date and hour are
+    sliced straight out of the timestamp (see _split_timestamp), and only
+    the last RECENT_ACTIVITY_COUNT entries are kept for the recent list.
+    """
+
+    def __init__(self):
+        # Per-date counts
+        self.sit_days = Counter()
+        self.stand_days = Counter()
+        self.transitions = Counter()
+        self.hourly = [{'sit': 0, 'stand': 0} for _ in range(24)]
+        self.tail = deque(maxlen=RECENT_ACTIVITY_COUNT)
+        self.offset = 0  # Bytes of the log counted so far
+        self.file_id = None  # (st_dev, st_ino) of the log those bytes came from
+        self.signature = None  # (mtime_ns, size) the summary was built for
+        self.summary = self.summarize()
+
+    def feed(self, f):
+        """Count complete lines from self.offset on; a trailing partial line
+        is left for the next call, once its newline has been written."""
+        f.seek(self.offset)
+        sit_days, stand_days, transitions = self.sit_days, self.stand_days, self.transitions
+        hourly, tail = self.hourly, self.tail
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break
+            self.offset += len(raw)
+
+            timestamp_str, sep, position = raw.decode('utf-8', 'replace').strip().partition(',')
+            if not sep:
                 continue
-            try:
-                timestamp_str, position = line.split(',', 1)
-                timestamp = datetime.fromisoformat(timestamp_str)
-                activities.append({
-                    'timestamp': timestamp_str,
-                    'position': position,
-                    'date': timestamp.strftime('%Y-%m-%d'),
-                    'time': timestamp.strftime('%H:%M'),
-                    'hour': timestamp.hour
-                })
-            except (ValueError, IndexError):
+            parsed = _split_timestamp(timestamp_str)
+            if parsed is None:
                 continue
-
-    return activities
-
-
-def calculate_daily_stats(activities):
-    """Calculate daily sit/stand statistics"""
-    daily_stats = defaultdict(lambda: {'sit_count': 0, 'stand_count': 0, 'transitions': 0})
-
-    for activity in activities:
-        date = activity['date']
-        position = activity['position']
-
-        if position == 'sit':
-            daily_stats[date]['sit_count'] += 1
-        elif position == 'stand':
-            daily_stats[date]['stand_count'] += 1
-
-        daily_stats[date]['transitions'] += 1
-
-    # Convert to list sorted by date
-    result = []
-    for date in sorted(daily_stats.keys()):
-        stats = daily_stats[date]
-        result.append({
-            'date': date,
-            'sit_count': stats['sit_count'],
-            'stand_count': stats['stand_count'],
-            'transitions': stats['transitions']
-        })
-
-    return result
+            date, hhmm, hour = parsed
+
+            if position == 'sit':
+                sit_days[date] += 1
+                hourly[hour]['sit'] += 1
+            elif position == 'stand':
+                stand_days[date] += 1
+                hourly[hour]['stand'] += 1
+            transitions[date] += 1
+            tail.append((timestamp_str, position, date, hhmm, hour))
+
+    def summarize(self):
+        """Return (daily_stats, hourly_distribution, recent) for the charts."""
+        sit_days, stand_days, transitions = self.sit_days, self.stand_days, self.transitions
+        daily_stats = [
+            {
+                'date': date,
+                'sit_count': sit_days[date],
+                'stand_count': stand_days[date],
+                'transitions': transitions[date],
+            }
+            for date in sorted(transitions)
+        ]
+        hourly_dist = [
+            dict(template, **counts)
+            for template, counts in zip(_HOUR_TEMPLATE, self.hourly)
+        ]
+        # Most recent first
+        recent = [
+            {
+                'timestamp': timestamp_str,
+                'position': position,
+                'date': date,
+                'time': hhmm,
+                'hour': hour,
+            }
+            for timestamp_str, position, date, hhmm, hour in reversed(self.tail)
+        ]
+        return daily_stats, hourly_dist, recent
 
 
-def calculate_hourly_distribution(activities):
-    """Calculate hourly distribution of standing"""
-    hourly = defaultdict(lambda: {'sit': 0, 'stand': 0})
+_activity_stats = ActivityStats()
 
-    for activity in activities:
-        hour = activity['hour']
-        position = activity['position']
-        hourly[hour][position] += 1
 
-    result = []
-    for hour in range(24):
-        result.append({
-            'hour': hour,
-            'label': f"{hour:02d}:00",
-            'sit': hourly[hour]['sit'],
-            'stand': hourly[hour]['stand']
-        })
+def get_stats():
+    """
+    Return (daily_stats, hourly_distribution, recent) for the desk log.
 
-    return result
+    The result is cached against the log's mtime and size, so dashboard
+    polls between sit/stand changes cost one stat(). When the log has only
+    grown, just the appended lines are read; a shrunk or replaced (rotated,
+    recreated) log is recounted from the start.
+    """
+    global _activity_stats
+    try:
+        st = LOG_FILE.stat()
+    except FileNotFoundError:
+        _activity_stats = ActivityStats()
+        return _activity_stats.summary
+
+    stats = _activity_stats
+    signature = (st.st_mtime_ns, st.st_size)
+    if signature == stats.signature:
+        return stats.summary
+
+    file_id = (st.st_dev, st.st_ino)
+    if st.st_size < stats.offset or (stats.file_id and file_id != stats.file_id):
+        stats = _activity_stats = ActivityStats()
+    stats.file_id = file_id
+    with open(LOG_FILE, 'rb', buffering=1 << 16) as f:
+        stats.feed(f)
+    stats.signature = signature
+    stats.summary = stats.summarize()
+    return stats.summary
+
+
+# Dashboard page and its assets, served from static/. Each is gzipped once
+# at import for the clients that accept it (nearly all); the rest get a
+# sendfile() FileResponse.
+STATIC_DIR = Path(__file__).parent / 'static'
+DASHBOARD_FILE = STATIC_DIR / 'dashboard.html'
+_STATIC_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'text/javascript; charset=utf-8',
+}
+
+
+class StaticAsset(NamedTuple):
+    path: Path
+    headers: dict
+    gzip_body: bytes
+    gzip_headers: dict
+    gzip_etag: str
+
+
+def _load_asset(path: Path) -> StaticAsset:
+    headers = {
+        'Content-Type': _STATIC_TYPES[path.suffix],
+        'Cache-Control': 'public, max-age=300',
+        'Vary': 'Accept-Encoding',
+    }
+    body = path.read_bytes()
+    # Content hash, so the tag only changes when the file does
+    etag = '"%s-gz"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+    return StaticAsset(
+        path, headers,
+        gzip.compress(body, 9, mtime=0),
+        dict(headers, **{'Content-Encoding': 'gzip', 'ETag': etag}),
+        etag,
+    )
+
+
+_ASSETS = {
+    path.name: _load_asset(path)
+    for path in sorted(STATIC_DIR.iterdir()) if path.suffix in _STATIC_TYPES
+}
+
+
+def serve_asset(request, asset: StaticAsset):
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        if request.headers.get('If-None-Match') == asset.gzip_etag:
+            return web.Response(status=304, headers=asset.gzip_headers)
+        return web.Response(body=asset.gzip_body, headers=asset.gzip_headers)
+    # FileResponse does its own ETag/Last-Modified revalidation
+    return web.FileResponse(asset.path, headers=asset.headers)
 
 
 # Web handlers
 async def handle_index(request):
     """Serve the main HTML page"""
-    html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Uplift Desk Controller</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/three@0.128.0/examples/js/controls/OrbitControls.js"></script>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-
-        :root {
-            --bg-primary: #0d1117;
-            --bg-secondary: #161b22;
-            --bg-card: #1c2128;
-            --bg-hover: #262c36;
-            --text-primary: #f0f3f6;
-            --text-secondary: #9ca3af;
-            --text-muted: #6b7280;
-            --accent: #3b82f6;
-            --accent-light: #60a5fa;
-            --success: #22c55e;
-            --border: rgba(255,255,255,0.08);
-        }
-
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Inter', sans-serif;
-            background: var(--bg-primary);
-            min-height: 100vh;
-            color: var(--text-primary);
-            -webkit-font-smoothing: antialiased;
-        }
-
-        .app-layout {
-            display: flex;
-            min-height: 100vh;
-        }
-
-        /* Left Panel - Controls */
-        .sidebar {
-            width: 320px;
-            background: var(--bg-secondary);
-            border-right: 1px solid var(--border);
-            padding: 24px;
-            display: flex;
-            flex-direction: column;
-            position: sticky;
-            top: 0;
-            height: 100vh;
-            overflow-y: auto;
-        }
-
-        .brand {
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-bottom: 32px;
-            padding-bottom: 20px;
-            border-bottom: 1px solid var(--border);
-        }
-
-        .brand-icon {
-            width: 36px;
-            height: 36px;
-            background: linear-gradient(135deg, var(--accent) 0%, #8b5cf6 100%);
-            border-radius: 8px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 18px;
-            color: white;
-        }
-
-        .brand-text {
-            font-size: 18px;
-            font-weight: 600;
-        }
-
-        /* Status */
-        .status-section {
-            background: var(--bg-card);
-            border-radius: 12px;
-            padding: 16px;
-            margin-bottom: 20px;
-        }
-
-        .status-row {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }
-
-        .status-left {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-
-        .status-dot {
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-            background: var(--text-muted);
-            transition: all 0.3s ease;
-        }
-
-        .status-dot.connected {
-            background: var(--success);
-            box-shadow: 0 0 12px var(--success);
-        }
-
-        .status-label {
-            font-size: 13px;
-            color: var(--text-muted);
-        }
-
-        .status-value {
-            font-size: 13px;
-            color: var(--text-secondary);
-            font-weight: 500;
-        }
-
-        /* Height Display */
-        .height-section {
-            text-align: center;
-            padding: 24px 0;
-            margin-bottom: 20px;
-        }
-
-        .height-value {
-            font-size: 56px;
-            font-weight: 700;
-            letter-spacing: -2px;
-            color: var(--text-primary);
-            font-variant-numeric: tabular-nums;
-            line-height: 1;
-        }
-
-        .height-label {
-            font-size: 12px;
-            color: var(--text-muted);
-            margin-top: 8px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-
-        /* Controls */
-        .controls {
-            display: flex;
-            flex-direction: column;
-            gap: 8px;
-        }
-
-        .control-group {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 8px;
-        }
-
-        button {
-            padding: 14px 16px;
-            font-size: 14px;
-            font-weight: 600;
-            border: none;
-            border-radius: 8px;
-            cursor: pointer;
-            transition: all 0.15s ease;
-            color: var(--text-primary);
-            background: var(--bg-card);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 8px;
-            border: 1px solid var(--border);
-        }
-
-        button:hover:not(:disabled) {
-            background: var(--bg-hover);
-            border-color: rgba(255,255,255,0.15);
-        }
-
-        button:active:not(:disabled) {
-            transform: scale(0.98);
-        }
-
-        button:disabled {
-            opacity: 0.4;
-            cursor: not-allowed;
-        }
-
-        .btn-primary {
-            background: var(--accent);
-            border-color: var(--accent);
-            color: white;
-        }
-
-        .btn-primary:hover:not(:disabled) {
-            background: #2563eb;
-            border-color: #2563eb;
-        }
-
-        .btn-stop {
-            background: #dc2626;
-            border-color: #dc2626;
-            grid-column: span 2;
-        }
-
-        .btn-stop:hover:not(:disabled) {
-            background: #b91c1c;
-            border-color: #b91c1c;
-        }
-
-        .btn-secondary {
-            background: transparent;
-            font-size: 13px;
-            padding: 12px;
-        }
-
-        .variant-badge {
-            font-size: 10px;
-            color: var(--text-muted);
-            text-align: center;
-            margin-top: auto;
-            padding-top: 20px;
-            font-family: 'SF Mono', Monaco, monospace;
-        }
-
-        /* Main Content */
-        .main-content {
-            flex: 1;
-            padding: 24px;
-            overflow-y: auto;
-        }
-
-        .dashboard-grid {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 16px;
-            margin-bottom: 24px;
-        }
-
-        .stat-card {
-            background: var(--bg-secondary);
-            border-radius: 12px;
-            padding: 20px;
-            border: 1px solid var(--border);
-        }
-
-        .stat-label {
-            font-size: 12px;
-            color: var(--text-muted);
-            margin-bottom: 8px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-
-        .stat-value {
-            font-size: 32px;
-            font-weight: 700;
-            color: var(--text-primary);
-            letter-spacing: -1px;
-        }
-
-        .stat-trend {
-            font-size: 12px;
-            color: var(--success);
-            margin-top: 4px;
-        }
-
-        .charts-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 16px;
-            margin-bottom: 24px;
-        }
-
-        .card {
-            background: var(--bg-secondary);
-            border-radius: 12px;
-            padding: 20px;
-            border: 1px solid var(--border);
-        }
-
-        .card-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 16px;
-        }
-
-        .card-title {
-            font-size: 14px;
-            font-weight: 600;
-            color: var(--text-primary);
-        }
-
-        .chart-container {
-            position: relative;
-            height: 200px;
-        }
-
-        /* Activity List */
-        .activity-card {
-            background: var(--bg-secondary);
-            border-radius: 12px;
-            padding: 20px;
-            border: 1px solid var(--border);
-        }
-
-        .activity-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 16px;
-        }
-
-        .activity-title {
-            font-size: 14px;
-            font-weight: 600;
-        }
-
-        .activity-list {
-            max-height: 280px;
-            overflow-y: auto;
-        }
-
-        .activity-list::-webkit-scrollbar {
-            width: 4px;
-        }
-
-        .activity-list::-webkit-scrollbar-thumb {
-            background: var(--border);
-            border-radius: 2px;
-        }
-
-        .activity-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 12px 0;
-            border-bottom: 1px solid var(--border);
-        }
-
-        .activity-item:last-child {
-            border-bottom: none;
-        }
-
-        .activity-time {
-            font-size: 13px;
-            color: var(--text-muted);
-        }
-
-        .activity-badge {
-            padding: 4px 10px;
-            border-radius: 4px;
-            font-size: 11px;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.3px;
-        }
-
-        .activity-badge.sit {
-            background: rgba(59, 130, 246, 0.15);
-            color: var(--accent-light);
-        }
-
-        .activity-badge.stand {
-            background: rgba(34, 197, 94, 0.15);
-            color: #4ade80;
-        }
-
-        .empty-state {
-            color: var(--text-muted);
-            font-size: 13px;
-            padding: 32px;
-            text-align: center;
-        }
-
-        /* Main layout - center + right columns (sidebar is 1/5, these split remaining 4/5 equally) */
-        .main-layout {
-            display: flex;
-            gap: 20px;
-        }
-
-        /* Center Column - 3D preview + stats + activity (2/5 of total screen) */
-        .center-column {
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-            gap: 16px;
-        }
-
-        /* 3D Desk Visualization */
-        .desk-3d-card {
-            background: var(--bg-secondary);
-            border-radius: 12px;
-            padding: 20px;
-            border: 1px solid var(--border);
-            display: flex;
-            flex-direction: column;
-        }
-
-        .desk-3d-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 12px;
-        }
-
-        .desk-3d-title {
-            font-size: 14px;
-            font-weight: 600;
-        }
-
-        .desk-3d-hint {
-            font-size: 11px;
-            color: var(--text-muted);
-        }
-
-        .desk-3d-container {
-            height: 280px;
-            border-radius: 8px;
-            overflow: hidden;
-            background: linear-gradient(180deg, #1a1f2e 0%, #0d1117 100%);
-        }
-
-        .desk-3d-container canvas {
-            width: 100%;
-            height: 100%;
-        }
-
-        /* Stats Row - horizontal below 3D */
-        .stats-row {
-            display: flex;
-            gap: 12px;
-        }
-
-        .stats-row .stat-card {
-            flex: 1;
-            padding: 16px;
-        }
-
-        /* Center column activity */
-        .center-column .activity-card {
-            flex: 1;
-        }
-
-        .center-column .activity-list {
-            max-height: 200px;
-        }
-
-        /* Right Column - charts (2/5 of total screen, same as center) */
-        .right-column {
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-            gap: 12px;
-        }
-
-        .chart-card {
-            flex: 1;
-            padding: 16px;
-            display: flex;
-            flex-direction: column;
-        }
-
-        .chart-container-small {
-            flex: 1;
-            min-height: 150px;
-        }
-
-        /* Loading */
-        .loading-overlay {
-            display: none;
-            position: fixed;
-            inset: 0;
-            background: rgba(0,0,0,0.6);
-            backdrop-filter: blur(4px);
-            z-index: 1000;
-            align-items: center;
-            justify-content: center;
-        }
-
-        .loading-overlay.active {
-            display: flex;
-        }
-
-        .loading-spinner {
-            width: 40px;
-            height: 40px;
-            border: 3px solid var(--border);
-            border-top-color: var(--accent);
-            border-radius: 50%;
-            animation: spin 0.8s linear infinite;
-        }
-
-        @keyframes spin {
-            to { transform: rotate(360deg); }
-        }
-
-        /* Responsive - Tablet */
-        @media (max-width: 1024px) {
-            .app-layout {
-                flex-direction: column;
-            }
-
-            .sidebar {
-                width: 100%;
-                height: auto;
-                position: relative;
-                border-right: none;
-                border-bottom: 1px solid var(--border);
-            }
-
-            .main-layout {
-                flex-direction: column;
-            }
-
-            .center-column,
-            .right-column {
-                flex: none;
-                width: 100%;
-            }
-
-            .chart-container-small {
-                min-height: 150px;
-            }
-        }
-
-        /* Responsive - Mobile */
-        @media (max-width: 640px) {
-            .stats-row {
-                flex-direction: column;
-            }
-
-            .sidebar {
-                padding: 16px;
-            }
-
-            .main-content {
-                padding: 16px;
-            }
+    return serve_asset(request, _ASSETS[DASHBOARD_FILE.name])
 
-            .height-value {
-                font-size: 48px;
-            }
-        }
-    </style>
-</head>
-<body>
-    <!-- Loading Overlay -->
-    <div class="loading-overlay" id="loadingOverlay">
-        <div class="loading-spinner"></div>
-    </div>
-
-    <div class="app-layout">
-        <!-- Left Sidebar - Controls -->
-        <aside class="sidebar">
-            <div class="brand">
-                <div class="brand-icon">
-                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                        <rect x="2" y="6" width="20" height="3" rx="1"/>
-                        <path d="M4 9v9"/>
-                        <path d="M20 9v9"/>
-                        <path d="M12 9v5"/>
-                        <path d="M9 14h6"/>
-                    </svg>
-                </div>
-                <span class="brand-text">Desk Control</span>
-            </div>
-
-            <div class="status-section">
-                <div class="status-row">
-                    <div class="status-left">
-                        <span class="status-dot" id="statusDot"></span>
-                        <span class="status-label">Status</span>
-                    </div>
-                    <span class="status-value" id="statusText">Ready</span>
-                </div>
-            </div>
-
-            <div class="height-section">
-                <div class="height-value" id="height">--</div>
-                <div class="height-label">Current Height</div>
-            </div>
-
-            <div class="controls">
-                <div class="control-group">
-                    <button id="sitBtn" class="btn-primary" onclick="sendCommand('sit')">
-                        Sit
-                    </button>
-                    <button id="standBtn" class="btn-primary" onclick="sendCommand('stand')">
-                        Stand
-                    </button>
-                </div>
-
-                <div class="control-group">
-                    <button id="upBtn" onclick="sendCommand('up')">
-                        Up
-                    </button>
-                    <button id="downBtn" onclick="sendCommand('down')">
-                        Down
-                    </button>
-                </div>
-
-                <div class="control-group">
-                    <button id="stopBtn" class="btn-stop" onclick="sendCommand('stop')">
-                        Stop
-                    </button>
-                </div>
-
-                <div class="control-group">
-                    <button class="btn-secondary" onclick="sendMemory(3)" id="mem3Btn">
-                        Memory 3
-                    </button>
-                    <button class="btn-secondary" onclick="sendMemory(4)" id="mem4Btn">
-                        Memory 4
-                    </button>
-                </div>
-            </div>
-
-            <div class="variant-badge" id="variantBadge"></div>
-        </aside>
-
-        <!-- Main Content - 3D Preview + Charts -->
-        <main class="main-content">
-            <div class="main-layout">
-                <!-- Center Column - 3D Desk + Stats + Activity -->
-                <div class="center-column">
-                    <!-- 3D Desk Visualization -->
-                    <div class="desk-3d-card">
-                        <div class="desk-3d-header">
-                            <span class="desk-3d-title">Desk Preview</span>
-                            <span class="desk-3d-hint">Drag to rotate, scroll to zoom</span>
-                        </div>
-                        <div class="desk-3d-container" id="desk3dContainer"></div>
-                    </div>
-
-                    <!-- Today's Stats - Horizontal below 3D -->
-                    <div class="stats-row">
-                        <div class="stat-card">
-                            <div class="stat-label">Sit Today</div>
-                            <div class="stat-value" id="todaySit">0</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-label">Stand Today</div>
-                            <div class="stat-value" id="todayStand">0</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-label">Transitions</div>
-                            <div class="stat-value" id="todayTransitions">0</div>
-                        </div>
-                    </div>
-
-                    <!-- Recent Activity - Below stats -->
-                    <div class="activity-card">
-                        <div class="activity-header">
-                            <span class="activity-title">Recent Activity</span>
-                        </div>
-                        <div class="activity-list" id="activityList">
-                            <div class="empty-state">No activity recorded</div>
-                        </div>
-                    </div>
-                </div>
-
-                <!-- Right Column - Charts -->
-                <div class="right-column">
-                    <div class="card chart-card">
-                        <div class="card-header">
-                            <span class="card-title">Daily Activity</span>
-                        </div>
-                        <div class="chart-container-small">
-                            <canvas id="dailyChart"></canvas>
-                        </div>
-                    </div>
-
-                    <div class="card chart-card">
-                        <div class="card-header">
-                            <span class="card-title">Hourly Distribution</span>
-                        </div>
-                        <div class="chart-container-small">
-                            <canvas id="hourlyChart"></canvas>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </main>
-    </div>
-
-    <script>
-        let connected = false;
-        let dailyChart = null;
-        let hourlyChart = null;
-        let loadingTimeout = null;
-        let commandInProgress = false;
-
-        // Three.js 3D Desk variables
-        let scene, camera, renderer, deskGroup, controls;
-        let deskTop, leftLeg, rightLeg;
-        let targetHeight = 0.5; // Normalized 0-1 (0=sit, 1=stand)
-        let currentDeskHeight = 0.5;
-        let lastInteractionTime = 0;
-        let isUserInteracting = false;
-        const MIN_HEIGHT_INCHES = 25;
-        const MAX_HEIGHT_INCHES = 50;
-        const AUTO_ROTATE_DELAY = 2000; // 2 seconds after user stops interacting
-
-        function initDesk3D() {
-            const container = document.getElementById('desk3dContainer');
-            if (!container) return;
-
-            const width = container.clientWidth;
-            const height = container.clientHeight;
-
-            // Scene
-            scene = new THREE.Scene();
-
-            // Camera
-            camera = new THREE.PerspectiveCamera(45, width / height, 0.1, 1000);
-            camera.position.set(4, 3, 4);
-
-            // Renderer
-            renderer = new THREE.WebGLRenderer({ antialias: true, alpha: true });
-            renderer.setSize(width, height);
-            renderer.setPixelRatio(window.devicePixelRatio);
-            renderer.setClearColor(0x000000, 0);
-            container.appendChild(renderer.domElement);
-
-            // OrbitControls for drag/zoom
-            controls = new THREE.OrbitControls(camera, renderer.domElement);
-            controls.enableDamping = true;
-            controls.dampingFactor = 0.05;
-            controls.enablePan = false;
-            controls.minDistance = 3;
-            controls.maxDistance = 10;
-            controls.maxPolarAngle = Math.PI / 2; // Don't go below floor
-            controls.target.set(0, 1.5, 0);
-            controls.autoRotate = true;
-            controls.autoRotateSpeed = 1.0;
-
-            // Track user interaction
-            controls.addEventListener('start', () => {
-                isUserInteracting = true;
-                controls.autoRotate = false;
-            });
-            controls.addEventListener('end', () => {
-                isUserInteracting = false;
-                lastInteractionTime = Date.now();
-            });
-
-            // Lighting
-            const ambientLight = new THREE.AmbientLight(0xffffff, 0.4);
-            scene.add(ambientLight);
-
-            const directionalLight = new THREE.DirectionalLight(0xffffff, 0.8);
-            directionalLight.position.set(5, 10, 5);
-            scene.add(directionalLight);
-
-            const backLight = new THREE.DirectionalLight(0x3b82f6, 0.3);
-            backLight.position.set(-5, 5, -5);
-            scene.add(backLight);
-
-            // Create desk group
-            deskGroup = new THREE.Group();
-
-            // Materials
-            const deskTopMaterial = new THREE.MeshPhongMaterial({
-                color: 0x4a3728, // Warm wood brown
-                shininess: 30
-            });
-            const legMaterial = new THREE.MeshPhongMaterial({
-                color: 0x2a2a2a,
-                shininess: 50
-            });
-            const accentMaterial = new THREE.MeshPhongMaterial({
-                color: 0x3b82f6,
-                shininess: 80
-            });
-
-            // Desk top (wide rectangular surface)
-            const topGeometry = new THREE.BoxGeometry(3, 0.08, 1.5);
-            deskTop = new THREE.Mesh(topGeometry, deskTopMaterial);
-            deskTop.position.y = 2;
-            deskGroup.add(deskTop);
-
-            // Desk top accent edge (front)
-            const edgeGeometry = new THREE.BoxGeometry(3.02, 0.02, 0.02);
-            const frontEdge = new THREE.Mesh(edgeGeometry, accentMaterial);
-            frontEdge.position.set(0, -0.03, 0.75);
-            deskTop.add(frontEdge);
-
-            // Left leg (vertical column)
-            const legGeometry = new THREE.BoxGeometry(0.12, 2, 0.12);
-            leftLeg = new THREE.Mesh(legGeometry, legMaterial);
-            leftLeg.position.set(-1.2, 1, 0);
-            deskGroup.add(leftLeg);
-
-            // Right leg
-            rightLeg = new THREE.Mesh(legGeometry, legMaterial);
-            rightLeg.position.set(1.2, 1, 0);
-            deskGroup.add(rightLeg);
-
-            // Left leg foot
-            const footGeometry = new THREE.BoxGeometry(0.3, 0.05, 0.8);
-            const leftFoot = new THREE.Mesh(footGeometry, legMaterial);
-            leftFoot.position.set(-1.2, 0.025, 0);
-            deskGroup.add(leftFoot);
-
-            // Right leg foot
-            const rightFoot = new THREE.Mesh(footGeometry, legMaterial);
-            rightFoot.position.set(1.2, 0.025, 0);
-            deskGroup.add(rightFoot);
-
-            // Floor grid
-            const gridHelper = new THREE.GridHelper(8, 20, 0x333333, 0x222222);
-            gridHelper.position.y = 0;
-            scene.add(gridHelper);
-
-            scene.add(deskGroup);
-
-            // Handle resize
-            window.addEventListener('resize', onWindowResize);
-
-            // Start animation loop
-            animate();
-        }
-
-        function onWindowResize() {
-            const container = document.getElementById('desk3dContainer');
-            if (!container || !camera || !renderer) return;
-
-            const width = container.clientWidth;
-            const height = container.clientHeight;
-
-            camera.aspect = width / height;
-            camera.updateProjectionMatrix();
-            renderer.setSize(width, height);
-        }
-
-        function updateDeskHeight(heightInches) {
-            // Convert inches to normalized value (0-1)
-            const normalized = (heightInches - MIN_HEIGHT_INCHES) / (MAX_HEIGHT_INCHES - MIN_HEIGHT_INCHES);
-            targetHeight = Math.max(0, Math.min(1, normalized));
-        }
-
-        function animate() {
-            requestAnimationFrame(animate);
-
-            // Re-enable auto-rotate after delay
-            if (!isUserInteracting && !controls.autoRotate) {
-                if (Date.now() - lastInteractionTime > AUTO_ROTATE_DELAY) {
-                    controls.autoRotate = true;
-                }
-            }
 
-            // Update controls
-            if (controls) {
-                controls.update();
-            }
+async def handle_static(request):
+    """Serve the dashboard's stylesheet and script"""
+    asset = _ASSETS.get(request.match_info['name'])
+    if asset is None:
+        raise web.HTTPNotFound()
+    return serve_asset(request, asset)
 
-            // Smooth height animation
-            currentDeskHeight += (targetHeight - currentDeskHeight) * 0.08;
-
-            // Update desk geometry based on height
-            if (deskTop && leftLeg && rightLeg) {
-                // Scale height from 1.5 (sit) to 2.5 (stand)
-                const deskY = 1.5 + currentDeskHeight * 1.0;
-                deskTop.position.y = deskY;
-
-                // Adjust leg heights
-                const legHeight = deskY;
-                leftLeg.scale.y = legHeight / 2;
-                leftLeg.position.y = legHeight / 2;
-                rightLeg.scale.y = legHeight / 2;
-                rightLeg.position.y = legHeight / 2;
-            }
 
-            if (renderer && scene && camera) {
-                renderer.render(scene, camera);
-            }
-        }
-
-        // Initialize 3D desk when DOM is ready
-        document.addEventListener('DOMContentLoaded', function() {
-            initDesk3D();
-        });
-
-        async function updateStatus() {
-            try {
-                const response = await fetch('/api/status');
-                const data = await response.json();
-
-                connected = data.connected;
-                const statusDot = document.getElementById('statusDot');
-                const statusText = document.getElementById('statusText');
-
-                statusDot.className = `status-dot ${connected ? 'connected' : ''}`;
-                statusText.textContent = connected ? 'Connected' : 'Ready';
-
-                const height = data.height;
-                if (connected && height) {
-                    const inches = (height / 25.4).toFixed(1);
-                    document.getElementById('height').textContent = `${inches}"`;
-                    // Update 3D desk visualization
-                    updateDeskHeight(parseFloat(inches));
-                } else {
-                    document.getElementById('height').textContent = '--';
-                }
-
-                if (data.variant) {
-                    document.getElementById('variantBadge').textContent = data.variant;
-                }
-            } catch (e) {
-                console.error('Error updating status:', e);
-            }
-        }
-
-        function showDelayedLoading(show) {
-            // Only show spinner if operation takes more than 3 seconds
-            if (show) {
-                loadingTimeout = setTimeout(() => {
-                    document.getElementById('loadingOverlay').classList.add('active');
-                }, 3000);
-            } else {
-                if (loadingTimeout) {
-                    clearTimeout(loadingTimeout);
-                    loadingTimeout = null;
-                }
-                document.getElementById('loadingOverlay').classList.remove('active');
-            }
-        }
-
-        function setButtonsDisabled(disabled) {
-            const buttons = ['sitBtn', 'standBtn', 'upBtn', 'downBtn', 'stopBtn', 'mem3Btn', 'mem4Btn'];
-            buttons.forEach(id => {
-                document.getElementById(id).disabled = disabled;
-            });
-        }
-
-        async function sendCommand(cmd) {
-            if (commandInProgress) return;
-            commandInProgress = true;
-
-            setButtonsDisabled(true);
-            showDelayedLoading(true);
-
-            try {
-                const response = await fetch('/api/command', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ command: cmd })
-                });
-                const data = await response.json();
-
-                if (!data.success) {
-                    if (data.needed_connection) {
-                        // Connection was needed but failed
-                        console.error('Connection failed:', data.error);
-                    } else {
-                        console.error('Command failed:', data.error);
-                    }
-                }
-
-                // Refresh activity data and status after command
-                if (cmd === 'sit' || cmd === 'stand') {
-                    setTimeout(loadActivityData, 500);
-                }
-                await updateStatus();
-            } catch (e) {
-                console.error('Error sending command:', e);
-            }
-
-            showDelayedLoading(false);
-            setButtonsDisabled(false);
-            commandInProgress = false;
-        }
-
-        async function sendMemory(slot) {
-            const cmdMap = { 3: 'mem3', 4: 'mem4' };
-            await sendCommand(cmdMap[slot] || 'stop');
-        }
-
-        async function loadActivityData() {
-            try {
-                const response = await fetch('/api/activity');
-                const data = await response.json();
-
-                updateDailyChart(data.daily_stats);
-                updateHourlyChart(data.hourly_distribution);
-                updateActivityList(data.recent);
-                updateTodayStats(data.today);
-            } catch (e) {
-                console.error('Error loading activity data:', e);
-            }
-        }
+# Per-process part of the /api/status ETag: rev restarts at 0 with the
+# server, so a tag cached before a restart must not match a new rev
+_BOOT_ID = int.from_bytes(os.urandom(4), 'big')
+# Last /api/status body and the state.rev it was built for
+_status_body = None
+_status_body_rev = -1
 
-        function updateDailyChart(dailyStats) {
-            const ctx = document.getElementById('dailyChart').getContext('2d');
 
-            // Get last 7 days
-            const last7 = dailyStats.slice(-7);
-            const labels = last7.map(d => {
-                const date = new Date(d.date);
-                return date.toLocaleDateString('en-US', { weekday: 'short', month: 'short', day: 'numeric' });
-            });
+def _format_status(s: DeskState) -> bytes:
+    """Render the fixed-shape /api/status payload without a json.dumps walk"""
+    height = s.height
+    height = b'%r' % height if s.connected and height is not None else b'null'
+    variant = json.dumps(s.variant).encode() if s.variant else b'null'
+    return b'{"connected": %s, "height": %s, "variant": %s}' % (
+        b'true' if s.connected else b'false', height, variant)
 
-            if (dailyChart) {
-                dailyChart.destroy();
-            }
 
-            dailyChart = new Chart(ctx, {
-                type: 'bar',
-                data: {
-                    labels: labels,
-                    datasets: [
-                        {
-                            label: 'Sit',
-                            data: last7.map(d => d.sit_count),
-                            backgroundColor: 'rgba(59, 130, 246, 0.8)',
-                            borderRadius: 3,
-                            barThickness: 16
-                        },
-                        {
-                            label: 'Stand',
-                            data: last7.map(d => d.stand_count),
-                            backgroundColor: 'rgba(34, 197, 94, 0.8)',
-                            borderRadius: 3,
-                            barThickness: 16
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: {
-                        legend: {
-                            position: 'top',
-                            labels: { color: '#5c5c66', font: { size: 11 } }
-                        }
-                    },
-                    scales: {
-                        x: {
-                            stacked: true,
-                            grid: { color: 'rgba(255,255,255,0.04)' },
-                            ticks: { color: '#5c5c66', font: { size: 10 } }
-                        },
-                        y: {
-                            stacked: true,
-                            grid: { color: 'rgba(255,255,255,0.04)' },
-                            ticks: { color: '#5c5c66', font: { size: 10 } }
-                        }
-                    }
-                }
-            });
-        }
-
-        function updateHourlyChart(hourlyData) {
-            const ctx = document.getElementById('hourlyChart').getContext('2d');
-
-            // Filter to working hours (6am - 10pm)
-            const workingHours = hourlyData.filter(h => h.hour >= 6 && h.hour <= 22);
-
-            if (hourlyChart) {
-                hourlyChart.destroy();
-            }
-
-            hourlyChart = new Chart(ctx, {
-                type: 'line',
-                data: {
-                    labels: workingHours.map(h => h.label),
-                    datasets: [
-                        {
-                            label: 'Stand',
-                            data: workingHours.map(h => h.stand),
-                            borderColor: 'rgba(34, 197, 94, 0.8)',
-                            backgroundColor: 'rgba(34, 197, 94, 0.1)',
-                            fill: true,
-                            tension: 0.4,
-                            borderWidth: 2,
-                            pointRadius: 0
-                        },
-                        {
-                            label: 'Sit',
-                            data: workingHours.map(h => h.sit),
-                            borderColor: 'rgba(59, 130, 246, 0.8)',
-                            backgroundColor: 'rgba(59, 130, 246, 0.1)',
-                            fill: true,
-                            tension: 0.4,
-                            borderWidth: 2,
-                            pointRadius: 0
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    interaction: {
-                        intersect: false,
-                        mode: 'index'
-                    },
-                    plugins: {
-                        legend: {
-                            position: 'top',
-                            labels: { color: '#5c5c66', font: { size: 11 } }
-                        }
-                    },
-                    scales: {
-                        x: {
-                            grid: { color: 'rgba(255,255,255,0.04)' },
-                            ticks: { color: '#5c5c66', font: { size: 10 } }
-                        },
-                        y: {
-                            grid: { color: 'rgba(255,255,255,0.04)' },
-                            ticks: { color: '#5c5c66', font: { size: 10 } }
-                        }
-                    }
-                }
-            });
-        }
-
-        function updateActivityList(recent) {
-            const list = document.getElementById('activityList');
-
-            if (!recent || recent.length === 0) {
-                list.innerHTML = '<div class="empty-state">No activity recorded</div>';
-                return;
-            }
-
-            list.innerHTML = recent.slice(0, 20).map(activity => `
-                <div class="activity-item">
-                    <span class="activity-time">${activity.time} &middot; ${activity.date}</span>
-                    <span class="activity-badge ${activity.position}">${activity.position}</span>
-                </div>
-            `).join('');
-        }
-
-        function updateTodayStats(today) {
-            document.getElementById('todaySit').textContent = today?.sit_count || 0;
-            document.getElementById('todayStand').textContent = today?.stand_count || 0;
-            document.getElementById('todayTransitions').textContent = today?.transitions || 0;
-        }
-
-        let statusPollInterval = null;
-
-        function startStatusPolling() {
-            // Poll status every 500ms while connected (for live height updates)
-            if (!statusPollInterval) {
-                statusPollInterval = setInterval(updateStatus, 500);
-            }
-        }
-
-        function stopStatusPolling() {
-            if (statusPollInterval) {
-                clearInterval(statusPollInterval);
-                statusPollInterval = null;
-            }
-        }
-
-        // Initial load
-        updateStatus();
-        loadActivityData();
-
-        // Poll status while connected to get live height updates
-        setInterval(() => {
-            if (connected) {
-                updateStatus();
-            }
-        }, 1000);
-    </script>
-</body>
-</html>
-"""
-    return web.Response(text=html, content_type='text/html')
+def status_body(s: DeskState) -> bytes:
+    """The /api/status body for a snapshot, rendered once per rev"""
+    global _status_body, _status_body_rev
+    if _status_body_rev != s.rev:
+        _status_body = _format_status(s)
+        _status_body_rev = s.rev
+    return _status_body
 
 
 async def handle_status(request):
-    """Return current status"""
-    return web.json_response({
-        'connected': connected,
-        'height': current_height if connected else None,
-        'variant': current_config.variant_name if current_config else None
+    """Return current status, or 304 if nothing changed since the client's copy"""
+    s = state
+    etag = '"%x-%d"' % (_BOOT_ID, s.rev)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.headers.get('If-None-Match') == etag:
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=status_body(s), content_type='application/json', headers=headers)
+
+
+def subscribe() -> asyncio.Queue:
+    """Register a status stream, primed with the current status"""
+    q = asyncio.Queue(maxsize=1)
+    q.put_nowait(status_body(state))
+    _subscribers.add(q)
+    return q
+
+
+async def handle_events(request):
+    """Stream status changes to the dashboard as Server-Sent Events"""
+    resp = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
     })
+    await resp.prepare(request)
+
+    q = subscribe()
+    try:
+        while True:
+            body = await q.get()
+            if body is None:  # Server shutting down
+                break
+            await resp.write(b'data: ' + body + b'\n\n')
+    except ConnectionResetError:
+        pass
+    finally:
+        _subscribers.discard(q)
+    return resp
+
+
+async def handle_ws(request):
+    """Push status changes over a WebSocket, one text message per change"""
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    q = subscribe()
+
+    async def send_updates():
+        while True:
+            body = await q.get()
+            if body is None:  # Server shutting down
+                await ws.close()
+                break
+            await ws.send_str(body.decode())
+
+    sender = asyncio.ensure_future(send_updates())
+    try:
+        # Clients only listen; reading keeps close frames and pings flowing
+        async for _ in ws:
+            pass
+    finally:
+        _subscribers.discard(q)
+        sender.cancel()
+        # A send to a departed client fails; collect that here rather than
+        # leaving asyncio to report it as never retrieved
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await sender
+    return ws
 
 
 async def handle_connect(request):
@@ -1404,9 +626,7 @@ async def handle_disconnect(request):
 
 async def ensure_connected():
     """Ensure we're connected to the desk, connecting if needed."""
-    global desk_client, connected
-
-    if connected and desk_client and desk_client.is_connected:
+    if state.connected and desk_client and desk_client.is_connected:
         return True
 
     # Need to connect
@@ -1422,14 +642,7 @@ async def handle_command(request):
     """Handle desk commands with implicit connection"""
     try:
         data = await request.json()
-        command = data.get('command')
-
-        # Map mem3/mem4 to actual command names if needed
-        cmd_map = {
-            'mem3': 'mem3',
-            'mem4': 'mem4',
-        }
-        cmd = cmd_map.get(command, command)
+        cmd = data.get('command')
 
         # Auto-connect if needed
         if not await ensure_connected():
@@ -1439,74 +652,100 @@ async def handle_command(request):
                 'needed_connection': True
             })
 
-        # For mem3/mem4, we need to add them to COMMANDS if not present
-        if cmd == 'mem3' and cmd not in COMMANDS:
-            success = await send_memory_command(3)
-        elif cmd == 'mem4' and cmd not in COMMANDS:
-            success = await send_memory_command(4)
-        else:
-            success = await send_desk_command(cmd)
+        success = await send_desk_command(cmd)
 
         return web.json_response({'success': success})
     except Exception as e:
         return web.json_response({'success': False, 'error': str(e)})
 
 
-async def send_memory_command(slot: int):
-    """Send memory slot command"""
-    global desk_client, current_config
-
-    if not desk_client or not desk_client.is_connected or not current_config:
-        return False
+# Largest ?days=N /api/activity serves, which also bounds _activity_bodies
+MAX_ACTIVITY_DAYS = 366
+# Encoded /api/activity bodies, keyed by the days limit; kept until
+# get_stats() returns a new summary or the date changes
+_activity_bodies = {}
+_activity_key = (None, None)
 
-    # Memory slots: 1=0x05, 2=0x06, 3=0x07, 4=0x08
-    opcode = 0x04 + slot
-    command = create_command_packet(opcode)
 
+def _activity_etag(today: str, days: Optional[int]) -> str:
+    """Weak ETag for /api/activity, derived from the log's stat() alone."""
     try:
-        if current_config.requires_wake:
-            await send_wake_sequence(desk_client, current_config.input_char_uuid)
-
-        await desk_client.write_gatt_char(current_config.input_char_uuid, command, response=False)
-        await asyncio.sleep(0.15)
-        await desk_client.write_gatt_char(current_config.input_char_uuid, command, response=False)
-        return True
-    except Exception as e:
-        print(f"Error sending memory command: {e}")
-        return False
+        st = LOG_FILE.stat()
+        mtime, size = st.st_mtime_ns, st.st_size
+    except FileNotFoundError:
+        mtime = size = 0
+    return 'W/"%x-%x-%s-%s"' % (mtime, size, today, days)
 
 
-async def handle_activity(request):
-    """Return activity data for charts"""
-    activities = parse_log_file()
-    daily_stats = calculate_daily_stats(activities)
-    hourly_dist = calculate_hourly_distribution(activities)
-
+def _activity_body(summary, today: str, days: Optional[int]) -> bytes:
+    daily_stats, hourly_dist, recent = summary
     # Get today's stats
-    today = datetime.now().strftime('%Y-%m-%d')
-    today_stats = next((d for d in daily_stats if d['date'] == today),
+    today_stats = next((d for d in reversed(daily_stats) if d['date'] == today),
                        {'sit_count': 0, 'stand_count': 0, 'transitions': 0})
-
-    # Recent activities (last 20, reversed for most recent first)
-    recent = list(reversed(activities[-20:])) if activities else []
-
-    return web.json_response({
+    if days is not None:
+        daily_stats = daily_stats[-days:] if days > 0 else []
+    return json.dumps({
         'daily_stats': daily_stats,
         'hourly_distribution': hourly_dist,
         'recent': recent,
         'today': today_stats
-    })
+    }, separators=(',', ':')).encode()
+
+
+async def handle_activity(request):
+    """
+    Return activity data for charts.
+
+    ?days=N (0 to MAX_ACTIVITY_DAYS) limits daily_stats to the last N
+    logged days (the dashboard only charts a week). The ETag comes from
+    the log's mtime and size plus today's date, so a client that is up to
+    date gets an empty 304 before the log is looked at.
+    """
+    global _activity_key
+    days = request.query.get('days')
+    if days is not None:
+        if not (days.isascii() and days.isdigit()) or int(days) > MAX_ACTIVITY_DAYS:
+            raise web.HTTPBadRequest(text=f'days must be an integer from 0 to {MAX_ACTIVITY_DAYS}')
+        days = int(days)
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    etag = _activity_etag(today, days)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.headers.get('If-None-Match') == etag:
+        return web.Response(status=304, headers=headers)
+
+    summary = get_stats()
+    if _activity_key[0] is not summary or _activity_key[1] != today:
+        _activity_bodies.clear()
+        _activity_key = (summary, today)
+    body = _activity_bodies.get(days)
+    if body is None:
+        body = _activity_bodies[days] = _activity_body(summary, today, days)
+    return web.Response(body=body, content_type='application/json', headers=headers)
 
 
 async def on_shutdown(app):
     """Cleanup on shutdown"""
-    await disconnect_from_desk()
+    try:
+        await disconnect_from_desk()
+    finally:
+        # End open event streams so shutdown doesn't wait on them. Done
+        # last: a status offered after the end marker would replace it
+        for q in _subscribers:
+            _offer(q, None)
+        flush_log()
 
 
 def main():
+    # Surface desk_control's connection messages alongside our own output
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     app = web.Application()
     app.router.add_get('/', handle_index)
+    app.router.add_get('/static/{name}', handle_static)
     app.router.add_get('/api/status', handle_status)
+    app.router.add_get('/api/events', handle_events)
+    app.router.add_get('/ws', handle_ws)
     app.router.add_get('/api/activity', handle_activity)
     app.router.add_post('/api/connect', handle_connect)
     app.router.add_post('/api/disconnect', handle_disconnect)
@@ -1521,7 +760,8 @@ def main():
     print("Press Ctrl+C to stop the server")
     print("="*70 + "\n")
 
-    web.run_app(app, host='127.0.0.1', port=8080)
+    # No access log: a line per request is noise for a local dashboard
+    web.run_app(app, host='127.0.0.1', port=8080, access_log=None)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,613 @@
+let connected = false;
+let dailyChart = null;
+let hourlyChart = null;
+let loadingTimeout = null;
+let commandInProgress = false;
+
+// Three.js 3D Desk variables
+let scene, camera, renderer, deskGroup, controls;
+let deskTop, legs;
+// Leg x offsets, and a scratch matrix for positioning the leg instances
+const LEG_X = [-1.2, 1.2];
+let legMatrix;
+let targetHeight = 0.5; // Normalized 0-1 (0=sit, 1=stand)
+let currentDeskHeight = 0.5;
+let lastInteractionTime = 0;
+let isUserInteracting = false;
+// Render only when something on screen changed
+let needsRender = true;
+let heightDirty = true;
+let resizePending = false;
+// The scene is built, and the animation loop runs, only while on screen
+let desk3dVisible = true;
+let animating = false;
+const MIN_HEIGHT_INCHES = 25;
+const MAX_HEIGHT_INCHES = 50;
+const AUTO_ROTATE_DELAY = 2000; // 2 seconds after user stops interacting
+
+function initDesk3D() {
+    const container = document.getElementById('desk3dContainer');
+    if (!container) return;
+
+    const width = container.clientWidth;
+    const height = container.clientHeight;
+
+    // Scene
+    scene = new THREE.Scene();
+
+    // Camera
+    camera = new THREE.PerspectiveCamera(45, width / height, 0.1, 1000);
+    camera.position.set(4, 3, 4);
+
+    // Renderer
+    renderer = new THREE.WebGLRenderer({ antialias: true, alpha: true });
+    renderer.setSize(width, height);
+    renderer.setPixelRatio(window.devicePixelRatio);
+    renderer.setClearColor(0x000000, 0);
+    container.appendChild(renderer.domElement);
+
+    // OrbitControls for drag/zoom
+    controls = new THREE.OrbitControls(camera, renderer.domElement);
+    controls.enableDamping = true;
+    controls.dampingFactor = 0.05;
+    controls.enablePan = false;
+    controls.minDistance = 3;
+    controls.maxDistance = 10;
+    controls.maxPolarAngle = Math.PI / 2; // Don't go below floor
+    controls.target.set(0, 1.5, 0);
+    controls.autoRotate = true;
+    controls.autoRotateSpeed = 1.0;
+
+    // Track user interaction
+    controls.addEventListener('start', () => {
+        isUserInteracting = true;
+        controls.autoRotate = false;
+    });
+    controls.addEventListener('end', () => {
+        isUserInteracting = false;
+        lastInteractionTime = Date.now();
+    });
+    // Fired by controls.update() whenever the camera moves (drag,
+    // damping, auto-rotate)
+    controls.addEventListener('change', () => {
+        needsRender = true;
+    });
+
+    // Lighting
+    const ambientLight = new THREE.AmbientLight(0xffffff, 0.4);
+    scene.add(ambientLight);
+
+    const directionalLight = new THREE.DirectionalLight(0xffffff, 0.8);
+    directionalLight.position.set(5, 10, 5);
+    scene.add(directionalLight);
+
+    const backLight = new THREE.DirectionalLight(0x3b82f6, 0.3);
+    backLight.position.set(-5, 5, -5);
+    scene.add(backLight);
+
+    // Create desk group
+    deskGroup = new THREE.Group();
+
+    // Materials
+    const deskTopMaterial = new THREE.MeshPhongMaterial({
+        color: 0x4a3728, // Warm wood brown
+        shininess: 30
+    });
+    const legMaterial = new THREE.MeshPhongMaterial({
+        color: 0x2a2a2a,
+        shininess: 50
+    });
+    const accentMaterial = new THREE.MeshPhongMaterial({
+        color: 0x3b82f6,
+        shininess: 80
+    });
+
+    // Desk top (wide rectangular surface)
+    const topGeometry = new THREE.BoxGeometry(3, 0.08, 1.5);
+    deskTop = new THREE.Mesh(topGeometry, deskTopMaterial);
+    deskTop.position.y = 2;
+    deskGroup.add(deskTop);
+
+    // Desk top accent edge (front)
+    const edgeGeometry = new THREE.BoxGeometry(3.02, 0.02, 0.02);
+    const frontEdge = new THREE.Mesh(edgeGeometry, accentMaterial);
+    frontEdge.position.set(0, -0.03, 0.75);
+    deskTop.add(frontEdge);
+
+    // Legs (vertical columns), one draw call for both; their height is
+    // set in animate()
+    const legGeometry = new THREE.BoxGeometry(0.12, 2, 0.12);
+    legMatrix = new THREE.Matrix4();
+    legs = new THREE.InstancedMesh(legGeometry, legMaterial, LEG_X.length);
+    // Instances sit away from the geometry's origin; don't cull on it
+    legs.frustumCulled = false;
+    deskGroup.add(legs);
+
+    // Feet, likewise instanced
+    const footGeometry = new THREE.BoxGeometry(0.3, 0.05, 0.8);
+    const feet = new THREE.InstancedMesh(footGeometry, legMaterial, LEG_X.length);
+    feet.frustumCulled = false;
+    LEG_X.forEach((x, i) => feet.setMatrixAt(i, legMatrix.makeTranslation(x, 0.025, 0)));
+    deskGroup.add(feet);
+
+    // Floor grid
+    const gridHelper = new THREE.GridHelper(8, 20, 0x333333, 0x222222);
+    gridHelper.position.y = 0;
+    scene.add(gridHelper);
+
+    scene.add(deskGroup);
+
+    // Handle resize, at most once per frame
+    window.addEventListener('resize', () => {
+        if (resizePending) return;
+        resizePending = true;
+        requestAnimationFrame(() => {
+            resizePending = false;
+            onWindowResize();
+        });
+    });
+
+    // Start animation loop
+    startAnimation();
+}
+
+function onWindowResize() {
+    const container = document.getElementById('desk3dContainer');
+    if (!container || !camera || !renderer) return;
+
+    const width = container.clientWidth;
+    const height = container.clientHeight;
+    const pixelRatio = renderer.getPixelRatio();
+    const canvas = renderer.domElement;
+    if (canvas.width === Math.floor(width * pixelRatio) &&
+        canvas.height === Math.floor(height * pixelRatio)) return;
+
+    camera.aspect = width / height;
+    camera.updateProjectionMatrix();
+    renderer.setSize(width, height);
+    needsRender = true;
+}
+
+function updateDeskHeight(heightInches) {
+    // Convert inches to normalized value (0-1)
+    const normalized = (heightInches - MIN_HEIGHT_INCHES) / (MAX_HEIGHT_INCHES - MIN_HEIGHT_INCHES);
+    targetHeight = Math.max(0, Math.min(1, normalized));
+    heightDirty = true;
+}
+
+function startAnimation() {
+    if (animating) return;
+    animating = true;
+    requestAnimationFrame(animate);
+}
+
+function animate() {
+    // Off screen: let the loop lapse until the desk scrolls back into view
+    if (!desk3dVisible) {
+        animating = false;
+        return;
+    }
+    requestAnimationFrame(animate);
+
+    // Re-enable auto-rotate after delay
+    if (!isUserInteracting && !controls.autoRotate) {
+        if (Date.now() - lastInteractionTime > AUTO_ROTATE_DELAY) {
+            controls.autoRotate = true;
+        }
+    }
+
+    // Update controls
+    if (controls) {
+        controls.update();
+    }
+
+    // Smooth height animation; once converged, snap to the target with one
+    // last geometry write and leave the transforms alone after that
+    const delta = targetHeight - currentDeskHeight;
+    if (Math.abs(delta) > 1e-4) {
+        currentDeskHeight += delta * 0.08;
+        heightDirty = true;
+    } else if (currentDeskHeight !== targetHeight) {
+        currentDeskHeight = targetHeight;
+        heightDirty = true;
+    }
+
+    // Update desk geometry based on height
+    if (heightDirty && deskTop && legs) {
+        // Scale height from 1.5 (sit) to 2.5 (stand)
+        const deskY = 1.5 + currentDeskHeight * 1.0;
+        deskTop.position.y = deskY;
+
+        // Adjust leg heights
+        const legHeight = deskY;
+        LEG_X.forEach((x, i) => {
+            legMatrix.makeScale(1, legHeight / 2, 1).setPosition(x, legHeight / 2, 0);
+            legs.setMatrixAt(i, legMatrix);
+        });
+        legs.instanceMatrix.needsUpdate = true;
+        heightDirty = false;
+        needsRender = true;
+    }
+
+    // A static scene keeps the last frame; skip the draw
+    if (needsRender && renderer && scene && camera) {
+        renderer.render(scene, camera);
+        needsRender = false;
+    }
+}
+
+// Initialize 3D desk the first time it becomes visible
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('desk3dContainer');
+    if (!container || !window.IntersectionObserver) {
+        initDesk3D();
+        return;
+    }
+    new IntersectionObserver((entries) => {
+        desk3dVisible = entries[entries.length - 1].isIntersecting;
+        if (!desk3dVisible) return;
+        if (!renderer) {
+            initDesk3D();
+        } else {
+            startAnimation();
+        }
+    }).observe(container);
+});
+
+// Elements updated on every status push or activity refresh, looked up once
+// (the script is deferred, so the document is already parsed)
+const statusDot = document.getElementById('statusDot');
+const statusText = document.getElementById('statusText');
+const heightText = document.getElementById('height');
+const variantBadge = document.getElementById('variantBadge');
+const todaySit = document.getElementById('todaySit');
+const todayStand = document.getElementById('todayStand');
+const todayTransitions = document.getElementById('todayTransitions');
+const commandButtons = ['sitBtn', 'standBtn', 'upBtn', 'downBtn', 'stopBtn', 'mem3Btn', 'mem4Btn']
+    .map(id => document.getElementById(id));
+
+// Wired up here rather than with inline onclick attributes, which could
+// fire before this deferred script has defined sendCommand
+for (const button of commandButtons) {
+    button.addEventListener('click', () => sendCommand(button.dataset.command));
+}
+
+function applyStatus(data) {
+    connected = data.connected;
+
+    statusDot.className = `status-dot ${connected ? 'connected' : ''}`;
+    statusText.textContent = connected ? 'Connected' : 'Ready';
+
+    const height = data.height;
+    if (connected && height) {
+        const inches = (height / 25.4).toFixed(1);
+        heightText.textContent = `${inches}"`;
+        // Update 3D desk visualization
+        updateDeskHeight(parseFloat(inches));
+    } else {
+        heightText.textContent = '--';
+    }
+
+    if (data.variant) {
+        variantBadge.textContent = data.variant;
+    }
+}
+
+async function updateStatus() {
+    try {
+        const response = await fetch('/api/status');
+        applyStatus(await response.json());
+    } catch (e) {
+        console.error('Error updating status:', e);
+    }
+}
+
+function showDelayedLoading(show) {
+    // Only show spinner if operation takes more than 3 seconds
+    if (show) {
+        loadingTimeout = setTimeout(() => {
+            document.getElementById('loadingOverlay').classList.add('active');
+        }, 3000);
+    } else {
+        if (loadingTimeout) {
+            clearTimeout(loadingTimeout);
+            loadingTimeout = null;
+        }
+        document.getElementById('loadingOverlay').classList.remove('active');
+    }
+}
+
+function setButtonsDisabled(disabled) {
+    for (const button of commandButtons) {
+        button.disabled = disabled;
+    }
+}
+
+async function sendCommand(cmd) {
+    if (commandInProgress) return;
+    commandInProgress = true;
+
+    setButtonsDisabled(true);
+    showDelayedLoading(true);
+
+    try {
+        const response = await fetch('/api/command', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ command: cmd })
+        });
+        const data = await response.json();
+
+        if (!data.success) {
+            if (data.needed_connection) {
+                // Connection was needed but failed
+                console.error('Connection failed:', data.error);
+            } else {
+                console.error('Command failed:', data.error);
+            }
+        }
+
+        // Refresh activity data after a position change. Status changes
+        // arrive over /api/events
+        if (cmd === 'sit' || cmd === 'stand') {
+            setTimeout(loadActivityData, 500);
+        }
+    } catch (e) {
+        console.error('Error sending command:', e);
+    }
+
+    showDelayedLoading(false);
+    setButtonsDisabled(false);
+    commandInProgress = false;
+}
+
+async function loadActivityData() {
+    try {
+        const response = await fetch('/api/activity?days=7');
+        const data = await response.json();
+
+        updateDailyChart(data.daily_stats);
+        updateHourlyChart(data.hourly_distribution);
+        updateActivityList(data.recent);
+        updateTodayStats(data.today);
+    } catch (e) {
+        console.error('Error loading activity data:', e);
+    }
+}
+
+// One formatter for every daily chart label, and each date formatted once
+const dayLabelFormat = new Intl.DateTimeFormat('en-US', { weekday: 'short', month: 'short', day: 'numeric' });
+const dayLabels = new Map();
+
+function dayLabel(isoDate) {
+    let label = dayLabels.get(isoDate);
+    if (label === undefined) {
+        label = dayLabelFormat.format(new Date(isoDate));
+        dayLabels.set(isoDate, label);
+    }
+    return label;
+}
+
+function updateDailyChart(dailyStats) {
+    // Get last 7 days
+    const last7 = dailyStats.slice(-7);
+    const labels = last7.map(d => dayLabel(d.date));
+    const sitCounts = last7.map(d => d.sit_count);
+    const standCounts = last7.map(d => d.stand_count);
+
+    // Refresh the existing chart in place rather than rebuilding it
+    if (dailyChart) {
+        dailyChart.data.labels = labels;
+        dailyChart.data.datasets[0].data = sitCounts;
+        dailyChart.data.datasets[1].data = standCounts;
+        dailyChart.update('none');
+        return;
+    }
+
+    const ctx = document.getElementById('dailyChart').getContext('2d');
+    dailyChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [
+                {
+                    label: 'Sit',
+                    data: sitCounts,
+                    backgroundColor: 'rgba(59, 130, 246, 0.8)',
+                    borderRadius: 3,
+                    barThickness: 16
+                },
+                {
+                    label: 'Stand',
+                    data: standCounts,
+                    backgroundColor: 'rgba(34, 197, 94, 0.8)',
+                    borderRadius: 3,
+                    barThickness: 16
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'top',
+                    labels: { color: '#5c5c66', font: { size: 11 } }
+                }
+            },
+            scales: {
+                x: {
+                    stacked: true,
+                    grid: { color: 'rgba(255,255,255,0.04)' },
+                    ticks: { color: '#5c5c66', font: { size: 10 } }
+                },
+                y: {
+                    stacked: true,
+                    grid: { color: 'rgba(255,255,255,0.04)' },
+                    ticks: { color: '#5c5c66', font: { size: 10 } }
+                }
+            }
+        }
+    });
+}
+
+function updateHourlyChart(hourlyData) {
+    // Filter to working hours (6am - 10pm)
+    const workingHours = hourlyData.filter(h => h.hour >= 6 && h.hour <= 22);
+    const labels = workingHours.map(h => h.label);
+    const standCounts = workingHours.map(h => h.stand);
+    const sitCounts = workingHours.map(h => h.sit);
+
+    if (hourlyChart) {
+        hourlyChart.data.labels = labels;
+        hourlyChart.data.datasets[0].data = standCounts;
+        hourlyChart.data.datasets[1].data = sitCounts;
+        hourlyChart.update('none');
+        return;
+    }
+
+    const ctx = document.getElementById('hourlyChart').getContext('2d');
+    hourlyChart = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: labels,
+            datasets: [
+                {
+                    label: 'Stand',
+                    data: standCounts,
+                    borderColor: 'rgba(34, 197, 94, 0.8)',
+                    backgroundColor: 'rgba(34, 197, 94, 0.1)',
+                    fill: true,
+                    tension: 0.4,
+                    borderWidth: 2,
+                    pointRadius: 0
+                },
+                {
+                    label: 'Sit',
+                    data: sitCounts,
+                    borderColor: 'rgba(59, 130, 246, 0.8)',
+                    backgroundColor: 'rgba(59, 130, 246, 0.1)',
+                    fill: true,
+                    tension: 0.4,
+                    borderWidth: 2,
+                    pointRadius: 0
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            interaction: {
+                intersect: false,
+                mode: 'index'
+            },
+            plugins: {
+                legend: {
+                    position: 'top',
+                    labels: { color: '#5c5c66', font: { size: 11 } }
+                }
+            },
+            scales: {
+                x: {
+                    grid: { color: 'rgba(255,255,255,0.04)' },
+                    ticks: { color: '#5c5c66', font: { size: 10 } }
+                },
+                y: {
+                    grid: { color: 'rgba(255,255,255,0.04)' },
+                    ticks: { color: '#5c5c66', font: { size: 10 } }
+                }
+            }
+        }
+    });
+}
+
+// Keys of the entries currently shown in the activity list, newest first
+let renderedActivity = [];
+
+function activityKey(activity) {
+    // The full log timestamp (microseconds), so two presses in the same
+    // minute still get distinct keys
+    return activity.timestamp + ' ' + activity.position;
+}
+
+function activityItem(activity) {
+    const item = document.createElement('div');
+    item.className = 'activity-item';
+    const time = document.createElement('span');
+    time.className = 'activity-time';
+    time.textContent = `${activity.time} \u00b7 ${activity.date}`;
+    const badge = document.createElement('span');
+    badge.className = `activity-badge ${activity.position}`;
+    badge.textContent = activity.position;
+    item.append(time, badge);
+    return item;
+}
+
+function updateActivityList(recent) {
+    const list = document.getElementById('activityList');
+
+    if (!recent || recent.length === 0) {
+        list.innerHTML = '<div class="empty-state">No activity recorded</div>';
+        renderedActivity = [];
+        return;
+    }
+
+    recent = recent.slice(0, 20);
+    const keys = recent.map(activityKey);
+    if (keys[0] === renderedActivity[0] && keys.length === renderedActivity.length) return;
+
+    // New entries only ever arrive at the top: prepend those and trim the
+    // tail, unless the list no longer lines up with what is shown
+    const fresh = renderedActivity.length ? keys.indexOf(renderedActivity[0]) : -1;
+    if (fresh > 0 && keys.slice(fresh).every((k, i) => k === renderedActivity[i])) {
+        const items = document.createDocumentFragment();
+        recent.slice(0, fresh).forEach(activity => items.append(activityItem(activity)));
+        list.insertBefore(items, list.firstChild);
+        while (list.children.length > keys.length) list.lastElementChild.remove();
+    } else {
+        const items = document.createDocumentFragment();
+        recent.forEach(activity => items.append(activityItem(activity)));
+        list.replaceChildren(items);
+    }
+    renderedActivity = keys;
+}
+
+function updateTodayStats(today) {
+    todaySit.textContent = today?.sit_count || 0;
+    todayStand.textContent = today?.stand_count || 0;
+    todayTransitions.textContent = today?.transitions || 0;
+}
+
+let statusEvents = null;
+
+function startStatusEvents() {
+    // Server pushes every height and connection change as it happens.
+    // EventSource reconnects on its own, and each new stream starts with
+    // the current status, so nothing is missed while it is down.
+    if (!window.EventSource || statusEvents) return;
+    statusEvents = new EventSource('/api/events');
+    statusEvents.onmessage = (e) => applyStatus(JSON.parse(e.data));
+}
+
+function stopStatusEvents() {
+    if (statusEvents) {
+        statusEvents.close();
+        statusEvents = null;
+    }
+}
+
+// A hidden tab drops the status stream (the browser already pauses the
+// render loop); on return it reopens it and catches up on activity
+document.addEventListener('visibilitychange', () => {
+    if (document.hidden) {
+        stopStatusEvents();
+    } else {
+        startStatusEvents();
+        loadActivityData();
+    }
+});
+
+// Initial load; status then arrives over /api/events
+updateStatus();
+if (!document.hidden) startStatusEvents();
+loadActivityData();